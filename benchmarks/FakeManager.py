@@ -0,0 +1,55 @@
+import copy
+
+from ProtocolGenerator import generate_experiment, generate_item
+
+class FakeManager:
+    # local stand-in for `elabapy.Manager` that serves generated experiments and items
+    def __init__(self, steps=50, items=10, mixtures=5, uploads=3, upload_size=1024*1024,
+                 item_rows=1, item_paragraphs=1):
+        self.steps = steps
+        self.items = items
+        self.mixtures = mixtures
+        self.uploads = uploads
+        self.upload_size = upload_size
+        self.item_rows = item_rows
+        self.item_paragraphs = item_paragraphs
+        self.experiments = {}
+        self.requests = 0
+
+    def get_experiment(self, exp_id):
+        self.requests += 1
+        exp_id = int(exp_id)
+        if exp_id not in self.experiments:
+            self.experiments[exp_id] = generate_experiment(
+                exp_id,
+                self.steps,
+                self.items,
+                self.mixtures,
+                self.uploads,
+                self.upload_size
+            )
+
+        # NOTE: ELN2Crate modifies the experiment, so hand out a copy like a new response
+        return copy.deepcopy(self.experiments[exp_id])
+
+    def get_item(self, item_id):
+        self.requests += 1
+        return generate_item(int(item_id), self.item_rows, self.item_paragraphs)
+
+    def get_all_items(self):
+        self.requests += 1
+        return [
+            {'id': str(item_id), 'lastchange': generate_item(item_id)['lastchange']}
+            for item_id in range(1, self.items + 1)
+        ]
+
+    def iter_upload(self, upload_id, chunk_size):
+        # the content is generated while streaming, so large uploads do not use memory
+        self.requests += 1
+        line = ('%i,1.0,2.0,3.0\n' % (upload_id)).encode('utf-8')
+        chunk = line * (chunk_size // len(line) + 1)
+        for start in range(0, self.upload_size, chunk_size):
+            yield chunk[:min(chunk_size, self.upload_size - start)]
+
+    def get_upload(self, upload_id):
+        return b''.join(self.iter_upload(upload_id, self.upload_size or 1))
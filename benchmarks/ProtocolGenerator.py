@@ -0,0 +1,114 @@
+import random
+
+ROW = '<tr>\n<td>%s</td>\n<td>%s</td>\n</tr>\n'
+PARAGRAPH = '<p>Lorem <b>ipsum</b> dolor <a href="https://example.org">sit</a> amet.</p>\n'
+
+# NOTE: the researcher is pseudonymized as "Anonymous Person1", which is a known person
+RESEARCHER = 'Max Mustermann'
+# known manufacturers, see `Manufacturers.py`
+MANUFACTURERS = ['Eppendorf', 'Greiner', 'Carl Zeiss', 'ATCC']
+# descriptions of the steps, each of them contains at least one activity and a parameter
+DESCRIPTIONS = [
+    'Wash the cells with %s at 37 °C for 5 min',
+    'Add 2 ml of %s and incubate 10 min at 37°C',
+    'Stimulation with 5 V at 1 Hz for 20 ms using %s',
+    'Take out %s from fridge and store',
+    'Fill the dish with %s and incubate 30 min'
+]
+STAGES = [
+    'Preparation',
+    'Cell culture',
+    'Fluo-3 staining',
+    'Approach 1 without stimulation',
+    'Approach 2 with stimulation'
+]
+
+def generate_item(item_id, rows=1, paragraphs=1):
+    body = PARAGRAPH * paragraphs
+    body += '<p>Ordered by %s</p>\n<table>\n<tbody>\n' % (RESEARCHER)
+    body += ROW % ('ontology-item', 'http://purl.obolibrary.org/obo/CLO_%07i' % (item_id))
+    body += ROW % ('manufacturer', MANUFACTURERS[item_id % len(MANUFACTURERS)])
+    body += ROW % ('manufacturer-id', 'A-%i' % (item_id))
+    body += ''.join(ROW % ('comment', 'row %i' % (row)) for row in range(rows))
+    body += '</tbody>\n</table>\n' + PARAGRAPH * paragraphs
+
+    return {
+        'id': str(item_id),
+        'title': 'Item %i' % (item_id),
+        'category': 'Category %i' % (item_id % 3),
+        'body': body,
+        'lastchange': '2021-01-21 16:%02i:00' % (item_id % 60)
+    }
+
+def _link(item_id):
+    return '<a href="database.php?mode=view&amp;id=%i">Item %i</a>' % (item_id, item_id)
+
+def _mixture(rnd, items):
+    first, second = rnd.sample(range(1, items + 1), 2)
+    percentage = rnd.choice([90, 95, 99])
+    attribution = ' (Attributed to %s)' % (RESEARCHER) if rnd.random() < 0.5 else ''
+
+    return '<li>%s %i %% + %s %i %%%s</li>\n' % (
+        _link(first),
+        percentage,
+        _link(second),
+        100 - percentage,
+        attribution
+    )
+
+def generate_protocol(steps, items=10, mixtures=0, uploads=0, seed=0):
+    # Ca-imaging protocol as expected by `ELN2Crate._model_protocol`, the steps, the
+    # mixtures and the links to uploads are spread evenly over the stages
+    rnd = random.Random(seed)
+    body = '<h1>General information</h1>\n<table>\n<tbody>\n'
+    body += ROW % ('Researcher', RESEARCHER)
+    body += ROW % ('Objective', 'Measure the calcium response of the cells')
+    body += '</tbody>\n</table>\n<h1>Protocol</h1>\n'
+
+    step = 0
+    for stage_idx, stage in enumerate(STAGES):
+        body += '<h2>%s</h2>\n<ul>\n<li>%s LOT AB%i</li>\n' % (
+            stage,
+            _link(rnd.randint(1, items)),
+            rnd.randint(1, 3)
+        )
+        if stage_idx == 0:
+            # NOTE: every linked item has to be used in the protocol
+            body += ''.join('<li>%s</li>\n' % (_link(item_id)) for item_id in range(1, items + 1))
+        body += '</ul>\n<table>\n<tbody>\n'
+        body += ROW % ('Description', 'Time')
+        stage_steps = steps * (stage_idx + 1) // len(STAGES) - steps * stage_idx // len(STAGES)
+        for _ in range(stage_steps):
+            description = DESCRIPTIONS[step % len(DESCRIPTIONS)] % (_link(rnd.randint(1, items)))
+            stage_mixtures = mixtures * (step + 1) // steps - mixtures * step // steps
+            if stage_mixtures and items > 1:
+                description += '\n<ul>\n%s</ul>\n' % (
+                    ''.join(_mixture(rnd, items) for _ in range(stage_mixtures))
+                )
+            if uploads and step % 3 == 0:
+                description += ' <a href="app/download.php?f=x&amp;name=data_%i.csv">data</a>' % (
+                    step // 3 % uploads
+                )
+            body += ROW % (description, '%02i:%02i' % (10 + step // 60 % 10, step % 60))
+            step += 1
+        body += '</tbody>\n</table>\n'
+
+    return body
+
+def generate_experiment(exp_id, steps=50, items=10, mixtures=5, uploads=3, upload_size=1024*1024):
+    return {
+        'id': exp_id,
+        'title': 'Ca imaging %i' % (exp_id),
+        'body': generate_protocol(steps, items, mixtures, uploads, seed=exp_id),
+        'category': 'Success',
+        'tags': 'Ca-Imaging|Benchmark',
+        'lastchange': '2021-04-12 09:21:53',
+        'links': [{'itemid': str(item_id)} for item_id in range(1, items + 1)],
+        'uploads': [{
+            'id': 1000 * exp_id + upload,
+            'real_name': 'data_%i.csv' % (upload),
+            'long_name': 'data_%i_%i.csv' % (exp_id, upload),
+            'datetime': '2021-04-12 09:21:53',
+            'filesize': upload_size
+        } for upload in range(uploads)]
+    }
@@ -0,0 +1,102 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from eln2crate import ELN2Crate # pylint: disable=wrong-import-position
+from eln2crate.Instrumentation import Instrumentation # pylint: disable=wrong-import-position
+from FakeManager import FakeManager # pylint: disable=wrong-import-position
+
+DEFAULTS = {
+    'steps': 50,
+    'items': 10,
+    'mixtures': 5,
+    'uploads': 3
+}
+
+# the phases are summarized in the report
+PHASE_GROUPS = [
+    ('fetch', ['fetch']),
+    ('write', ['write_experiment_body', 'write_database_items', 'write_attachments']),
+    ('characterize', ['characterize']),
+    ('model', ['model_items', 'model_protocol', 'model_rocrate_base', 'model_attachments']),
+    ('zip', ['zip'])
+]
+
+def convert(size, upload_size, trace_memory):
+    # NOTE: runs in a new process, so that the peak memory belongs to this conversion
+    manager = FakeManager(upload_size=upload_size, **size)
+    # NOTE: the generated descriptions intentionally contain several activities
+    logger = logging.getLogger('benchmark')
+    logger.setLevel(logging.CRITICAL)
+    instrumentation = Instrumentation(trace_memory=trace_memory)
+    with tempfile.TemporaryDirectory() as target_folder:
+        model = ELN2Crate(logger, 'https://example.org/ns',
+                          'https://elab.example.org', manager, 1, ['Max Mustermann'],
+                          characterization='native', instrumentation=instrumentation)
+        model.convert(os.path.join(target_folder, 'ro-crate_1'), force=True)
+        del model
+
+    return instrumentation.as_dict()
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description='Measure how the conversion scales with the size of the experiment'
+    )
+    for dimension, default in DEFAULTS.items():
+        arg_parser.add_argument('--%s' % (dimension), type=int, nargs='+',
+                                default=[default, default * 4, default * 16])
+    arg_parser.add_argument('--upload-size', type=int, default=1024*1024)
+    arg_parser.add_argument('--trace-memory', action='store_true',
+                            help='report the peak of python allocations instead of the process')
+    arg_parser.add_argument('--output', help='write all measurements to this JSON file')
+    args = arg_parser.parse_args()
+
+    results = []
+    print('%-10s %6s %8s %8s %8s %8s %8s %8s %9s %8s %10s' % (
+        'dimension', 'size', 'total', *[name for name, _ in PHASE_GROUPS], 'peak MiB', 'triples',
+        'crate KiB'
+    ))
+    for dimension in DEFAULTS:
+        for value in getattr(args, dimension):
+            size = dict(DEFAULTS)
+            size[dimension] = value
+            with ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context('spawn')
+                ) as executor:
+                metrics = executor.submit(convert, size, args.upload_size, args.trace_memory)\
+                    .result()
+            results.append({'size': size, 'metrics': metrics})
+
+            phases = metrics['phases']
+            times = [
+                sum(phases[phase]['wall_time'] for phase in group if phase in phases)
+                for _, group in PHASE_GROUPS
+            ]
+            print('%-10s %6i %7.2fs %s %9.1f %8i %10.1f' % (
+                dimension,
+                value,
+                sum(times),
+                ' '.join('%7.2fs' % (phase_time) for phase_time in times),
+                max(
+                    phase.get('peak_memory', phase['process_peak_memory'])
+                    for phase in phases.values()
+                ) / 1024 / 1024,
+                metrics['counters']['triples'],
+                metrics['counters']['bytes_zipped'] / 1024
+            ))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from eln2crate.HTMLParsing import parse_html, parse_item_table, serialize_html # pylint: disable=wrong-import-position
+from ProtocolGenerator import generate_item, generate_protocol # pylint: disable=wrong-import-position
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare the HTML parser backends')
+    arg_parser.add_argument('--steps', type=int, default=2000)
+    arg_parser.add_argument('--items', type=int, default=50)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    protocol = generate_protocol(args.steps, args.items, mixtures=args.steps // 10)
+    items = [generate_item(item_id, rows=10, paragraphs=200)['body'] for item_id in range(1, args.items + 1)]
+
+    results = {}
+    for parser in ['html.parser', 'lxml']:
+        protocol_time = min(timeit.repeat(
+            lambda: parse_html(protocol, parser), number=1, repeat=args.repeat # pylint: disable=cell-var-from-loop
+        ))
+        items_full_time = min(timeit.repeat(
+            lambda: [parse_html(item, parser) for item in items], number=1, repeat=args.repeat # pylint: disable=cell-var-from-loop
+        ))
+        items_time = min(timeit.repeat(
+            lambda: [parse_item_table(item, parser) for item in items], # pylint: disable=cell-var-from-loop
+            number=1,
+            repeat=args.repeat
+        ))
+        results[parser] = (
+            serialize_html(parse_html(protocol, parser), protocol),
+            [str(parse_html(item, 'html.parser').find('table')) for item in items],
+            [str(parse_item_table(item, parser).find('table')) for item in items]
+        )
+        print('%-12s protocol: %.3fs, items: %.3fs (table only: %.3fs)' % (
+            parser,
+            protocol_time,
+            items_full_time,
+            items_time
+        ))
+
+    print('identical output: %s' % (results['html.parser'] == results['lxml']))
+
+if __name__ == '__main__':
+    main()
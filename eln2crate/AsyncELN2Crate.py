@@ -0,0 +1,249 @@
+import asyncio
+import functools
+import hashlib
+import os
+
+from urllib.parse import urljoin
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .Download import CHUNK_SIZE
+from .ELN2Crate import ELN2Crate
+from .Instrumentation import Instrumentation
+
+class AsyncElabFTWClient:
+    def __init__(self, endpoint, token, verify=True, max_connections=8):
+        # non-blocking counterpart of `elabapy.Manager` for the same REST API
+        if aiohttp is None:
+            raise ImportError('AsyncElabFTWClient requires aiohttp')
+        self.endpoint = endpoint
+        self.token = token
+        self.verify = verify
+        # NOTE: the limit is shared by all conversions that use this client
+        self.max_connections = max_connections
+        self.session = None
+
+    @classmethod
+    def from_manager(cls, elabftw_manager, **kwargs):
+        return cls(
+            elabftw_manager.endpoint,
+            elabftw_manager.token,
+            getattr(elabftw_manager, 'verify', True),
+            **kwargs
+        )
+
+    async def open(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers={'Authorization': self.token},
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    **({} if self.verify else {'ssl': False})
+                )
+            )
+
+        return self
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_json(self, path):
+        await self.open()
+        async with self.session.get(urljoin(self.endpoint, path)) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def get_experiment(self, exp_id):
+        return await self._get_json('experiments/%s' % (exp_id))
+
+    async def get_item(self, item_id):
+        return await self._get_json('items/%s' % (item_id))
+
+    async def get_all_items(self):
+        return await self._get_json('items/')
+
+    async def iter_upload(self, upload_id, chunk_size=CHUNK_SIZE):
+        await self.open()
+        async with self.session.get(urljoin(self.endpoint, 'uploads/%s' % (upload_id))) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+class PrefetchedManager:
+    def __init__(self, exp, items):
+        # serves an experiment and its items that have already been fetched, so that
+        # ELN2Crate does not send any requests
+        self.exp = exp
+        self.items = {str(item['id']): item for item in items}
+
+    def get_experiment(self, exp_id):
+        return self.exp
+
+    def get_item(self, item_id):
+        return self.items[str(item_id)]
+
+def _write_chunk(datafile, sha512, chunk):
+    datafile.write(chunk)
+    sha512.update(chunk)
+
+class AsyncELN2Crate:
+    def __init__(self, logger, namespace_url, elabftw_url, elabftw_client, exp_id,
+                 pseudonymize_persons, executor=None, **options):
+        # NOTE: nothing is fetched here, call `fetch` (or `convert`) inside the event loop
+        if options.get('item_cache'):
+            # the items are prefetched, an ItemCache would only see those of this experiment
+            # and replace the shared index of all items with them
+            raise ValueError('AsyncELN2Crate does not support an item_cache')
+        self.log = logger
+        self.namespace_url = namespace_url
+        self.elabftw_url = elabftw_url
+        # an AsyncElabFTWClient or any object with the same coroutines
+        self.elabftw_client = elabftw_client
+        self.exp_id = exp_id
+        self.pseudonymize_persons = pseudonymize_persons
+        # modeling and zipping run on this executor (by default the one of the event loop),
+        # a thread pool is required as the model stays in this process
+        self.executor = executor
+        self.fetch_workers = options.get('fetch_workers', 4)
+        self.download_chunk_size = options.get('download_chunk_size', CHUNK_SIZE)
+        options['instrumentation'] = options.get('instrumentation') or Instrumentation()
+        self.instrumentation = options['instrumentation']
+        # further keyword arguments are handed over to the ELN2Crate instance
+        self.options = options
+        # the ELN2Crate instance is created by `fetch`
+        self.model = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            functools.partial(func, *args)
+        )
+
+    async def _fetch_item(self, semaphore, item_id):
+        async with semaphore:
+            return await self.elabftw_client.get_item(item_id)
+
+    async def fetch(self):
+        with self.instrumentation.phase('fetch'):
+            exp = await self.elabftw_client.get_experiment(self.exp_id)
+            semaphore = asyncio.Semaphore(self.fetch_workers)
+            # NOTE: gather keeps the order of the links, independent of the response times
+            items = await asyncio.gather(*[
+                self._fetch_item(semaphore, link['itemid']) for link in exp.get('links')
+            ])
+        # parsing and pseudonymizing is recorded as a further call of the fetch phase
+        self.model = await self._run(functools.partial(
+            ELN2Crate,
+            self.log,
+            self.namespace_url,
+            self.elabftw_url,
+            PrefetchedManager(exp, items),
+            self.exp_id,
+            self.pseudonymize_persons,
+            **self.options
+        ))
+
+        return self.model
+
+    async def _download(self, upload_id, path):
+        # the file is written on the executor in order to not block the event loop
+        sha512 = hashlib.sha512()
+        size = 0
+        datafile = await self._run(open, path, 'wb')
+        try:
+            async for chunk in self.elabftw_client.iter_upload(upload_id, self.download_chunk_size):
+                await self._run(_write_chunk, datafile, sha512, chunk)
+                size += len(chunk)
+                self.instrumentation.count('bytes_downloaded', len(chunk))
+        finally:
+            await self._run(datafile.close)
+
+        return {
+            'filesize': size,
+            'sha512': sha512.hexdigest()
+        }
+
+    async def _write_attachment(self, semaphore, attachment_path, upload):
+        complete_name = os.path.join(attachment_path, upload['real_name'])
+        blob_store = self.model.blob_store
+        key = 'upload/%s/%s' % (upload['id'], upload['datetime'])
+        info = await self._run(blob_store.get_ref, key) if blob_store else None
+        if info:
+            # NOTE: the upload is only downloaded if it is not in the store yet
+            await self._run(blob_store.link, info['sha512'], complete_name)
+        else:
+            async with semaphore:
+                info = await self._download(upload['id'], complete_name)
+            if blob_store:
+                await self._run(blob_store.add_upload, key, complete_name, info)
+        self.model.manifest.add_file(os.path.join('Data', upload['real_name']), info)
+
+    async def _write_attachments(self):
+        attachment_path = os.path.join(self.model.tempfolder, 'Data')
+        await self._run(ELN2Crate.create_folder_if_not_exists, attachment_path)
+
+        # NOTE: like ELN2Crate, only the last of several uploads with the same name is written
+        uploads = {upload['real_name']: upload for upload in self.model.exp.get('uploads')}
+        semaphore = asyncio.Semaphore(self.fetch_workers)
+        await asyncio.gather(*[
+            self._write_attachment(semaphore, attachment_path, upload)
+            for upload in uploads.values()
+        ])
+
+    async def write_files(self):
+        # pylint: disable=protected-access
+        with self.instrumentation.phase('write_experiment_body'):
+            await self._run(self.model._write_experiment_body)
+        with self.instrumentation.phase('write_database_items'):
+            await self._run(self.model._write_database_items)
+        with self.instrumentation.phase('write_attachments'):
+            await self._write_attachments()
+
+    async def create_model(self):
+        model = self.model
+        with self.instrumentation.phase('characterize'):
+            if hasattr(model.characterization, 'characterize_async'):
+                model.sf_output = await model.characterization.characterize_async(
+                    model.tempfolder,
+                    model.manifest
+                )
+            else:
+                model.sf_output = await self._run(
+                    model.characterization.characterize,
+                    model.tempfolder,
+                    model.manifest
+                )
+            await self._run(model.manifest.load_characterization, model.sf_output, model.tempfolder)
+
+        return await self._run(model._build_model) # pylint: disable=protected-access
+
+    async def write_crate(self, target_archive):
+        await self._run(self.model.write_crate, target_archive)
+
+    async def write_ntriples(self, target_file, quads=False):
+        return await self._run(self.model.write_ntriples, target_file, quads)
+
+    async def convert(self, target_archive, force=False):
+        if self.model is None:
+            await self.fetch()
+        # re-use the existing crate if nothing has changed in elabFTW
+        if not force and await self._run(self.model.is_up_to_date, target_archive):
+            self.log.info('Crate "%s.zip" is up to date' % (target_archive))
+            return False
+
+        await self.write_files()
+        await self.create_model()
+        await self.write_crate(target_archive)
+
+        return True
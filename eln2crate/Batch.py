@@ -0,0 +1,119 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from .ELN2Crate import ELN2Crate, get_error_message
+from .Pseudonymizer import Pseudonymizer
+
+def _convert_experiment(logger, namespace_url, elabftw_url, elabftw_manager, exp_id,
+                        pseudonymize_persons, target_archive, force, options):
+    # NOTE: this runs inside a worker process, so every problem has to be reported
+    # as a result instead of being raised, otherwise the whole pool is affected
+    model = None
+    try:
+        model = ELN2Crate(logger, namespace_url, elabftw_url, elabftw_manager, exp_id,
+                          pseudonymize_persons, **options)
+        regenerated = model.convert(target_archive, force)
+    except Exception as e: # pylint: disable=broad-except
+        return {
+            'exp_id': exp_id,
+            'success': False,
+            'error': get_error_message(logger, exp_id, e),
+            'metrics': model.instrumentation.as_dict() if model else None
+        }
+
+    return {
+        'exp_id': exp_id,
+        'success': True,
+        'regenerated': regenerated,
+        'target': target_archive + '.zip',
+        'metrics': model.instrumentation.as_dict()
+    }
+
+class ELN2CrateBatch:
+    def __init__(self, logger, namespace_url, elabftw_url, elabftw_manager, pseudonymize_persons,
+                 workers=None, target_pattern='./ro-crate_%i', force=False, **options):
+        # NOTE: logger and elabftw_manager are sent to the worker processes, so both
+        # have to be picklable (which is the case for `logging` loggers and `elabapy.Manager`)
+        self.log = logger
+        self.namespace_url = namespace_url
+        self.elabftw_url = elabftw_url
+        self.elabftw_manager = elabftw_manager
+        # NOTE: all experiments share the same pseudonyms
+        if not isinstance(pseudonymize_persons, Pseudonymizer):
+            pseudonymize_persons = Pseudonymizer(pseudonymize_persons)
+        self.pseudonymizer = pseudonymize_persons
+        self.workers = workers
+        self.target_pattern = target_pattern
+        # regenerate crates even if nothing has changed since the last run
+        self.force = force
+        # further keyword arguments are handed over to each ELN2Crate instance
+        self.options = options
+
+    def _upload_size(self, exp_id):
+        try:
+            exp = self.elabftw_manager.get_experiment(exp_id)
+        except Exception: # pylint: disable=broad-except
+            # the worker will report the actual problem
+            return 0, 0
+
+        uploads = exp.get('uploads') or []
+        size = sum(int(upload.get('filesize') or 0) for upload in uploads)
+
+        return size, len(uploads)
+
+    def schedule(self, exp_ids):
+        # experiments with large uploads take longest, so start them first in
+        # order to not end up waiting for a single worker at the end of the run
+        # NOTE: the experiments are fetched concurrently (limited like the requests of a
+        # conversion), so that the workers do not wait for a serial pass over all of them
+        exp_ids = list(exp_ids)
+        with ThreadPoolExecutor(max_workers=self.options.get('fetch_workers', 4)) as executor:
+            sizes = dict(zip(exp_ids, executor.map(self._upload_size, exp_ids)))
+
+        return sorted(sizes.keys(), key=lambda exp_id: sizes[exp_id], reverse=True)
+
+    def run(self, exp_ids):
+        summary = {
+            'succeeded': [],
+            'failed': {},
+            'results': {}
+        }
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(
+                    _convert_experiment,
+                    self.log,
+                    self.namespace_url,
+                    self.elabftw_url,
+                    self.elabftw_manager,
+                    exp_id,
+                    self.pseudonymizer,
+                    self.target_pattern % (exp_id),
+                    self.force,
+                    self.options
+                ): exp_id for exp_id in self.schedule(list(exp_ids))
+            }
+
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e: # pylint: disable=broad-except
+                    # e.g. the worker process got killed
+                    result = {
+                        'exp_id': futures[future],
+                        'success': False,
+                        'error': '%s: %s' % (type(e).__name__, e)
+                    }
+                summary['results'][result['exp_id']] = result
+                if result['success']:
+                    summary['succeeded'].append(result['exp_id'])
+                else:
+                    self.log.error('Experiment %s failed: %s' % (result['exp_id'], result['error']))
+                    summary['failed'][result['exp_id']] = result['error']
+
+        self.log.info('Converted %i experiments, %i failed' % (
+            len(summary['succeeded']),
+            len(summary['failed'])
+        ))
+
+        return summary
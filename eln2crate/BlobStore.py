@@ -0,0 +1,150 @@
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from .Download import write_chunks
+
+# ioctl request for copy-on-write clones on Linux (e.g., btrfs and XFS)
+FICLONE = 0x40049409
+
+class BlobStore:
+    def __init__(self, path):
+        # NOTE: files are stored by their sha512 so that identical uploads and database
+        # items are only stored once for all crates
+        self.path = path
+        for folder in ['blobs', 'refs', 'tmp']:
+            os.makedirs(os.path.join(self.path, folder), exist_ok=True)
+
+    def _get_blob_path(self, sha512):
+        return os.path.join(self.path, 'blobs', sha512[:2], sha512[2:])
+
+    def _get_ref_path(self, key):
+        return os.path.join(
+            self.path,
+            'refs',
+            hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json'
+        )
+
+    def _add_blob(self, tmp_path, info):
+        blob_path = self._get_blob_path(info['sha512'])
+        if os.path.exists(blob_path):
+            os.remove(tmp_path)
+            return
+
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        # blobs are shared by hardlinks, so nobody should modify them
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, blob_path)
+
+    def _new_tmp_path(self):
+        tmp_file, tmp_path = tempfile.mkstemp(dir=os.path.join(self.path, 'tmp'))
+        os.close(tmp_file)
+
+        return tmp_path
+
+    def get_ref(self, key):
+        try:
+            with open(self._get_ref_path(key)) as ref_file:
+                info = json.load(ref_file)
+        except (OSError, ValueError):
+            return None
+
+        if not os.path.exists(self._get_blob_path(info['sha512'])):
+            return None
+
+        return info
+
+    def set_ref(self, key, info):
+        tmp_path = self._new_tmp_path()
+        with open(tmp_path, 'w') as ref_file:
+            json.dump(info, ref_file)
+        os.replace(tmp_path, self._get_ref_path(key))
+
+    def put_chunks(self, chunks):
+        tmp_path = self._new_tmp_path()
+        try:
+            info = write_chunks(chunks, tmp_path)
+        except:
+            os.remove(tmp_path)
+            raise
+        self._add_blob(tmp_path, info)
+
+        return info
+
+    def put_text(self, text):
+        data = text.encode('utf-8')
+        info = {
+            'filesize': len(data),
+            'sha512': hashlib.sha512(data).hexdigest()
+        }
+        if not os.path.exists(self._get_blob_path(info['sha512'])):
+            tmp_path = self._new_tmp_path()
+            write_chunks([data], tmp_path)
+            self._add_blob(tmp_path, info)
+
+        return info
+
+    @staticmethod
+    def _link_or_copy(blob_path, destination):
+        try:
+            os.link(blob_path, destination)
+            return
+        except OSError as e:
+            # e.g., the work folder is on another file system or the blob has too many links
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+
+        try:
+            with open(blob_path, 'rb') as source, open(destination, 'wb') as target:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            return
+        except OSError:
+            pass
+
+        shutil.copyfile(blob_path, destination)
+
+    def link(self, sha512, destination):
+        # NOTE: an existing destination (e.g., of two items or uploads with the same file
+        # name) might be a hardlink to another blob, so it must never be opened for writing,
+        # instead a new file replaces it
+        tmp_file, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(destination) or '.',
+            prefix='.blob-'
+        )
+        os.close(tmp_file)
+        os.remove(tmp_path)
+        try:
+            BlobStore._link_or_copy(self._get_blob_path(sha512), tmp_path)
+            os.replace(tmp_path, destination)
+        except:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def write_text(self, text, destination):
+        info = self.put_text(text)
+        self.link(info['sha512'], destination)
+
+        return info
+
+    def add_upload(self, key, path, info):
+        # for uploads that have already been written by the caller, e.g., by AsyncELN2Crate
+        if not os.path.exists(self._get_blob_path(info['sha512'])):
+            tmp_path = self._new_tmp_path()
+            shutil.copyfile(path, tmp_path)
+            self._add_blob(tmp_path, info)
+        self.set_ref(key, info)
+
+    def write_upload(self, key, chunks, destination):
+        # the key identifies an upload so that it does not need to be downloaded again
+        info = self.get_ref(key)
+        if not info:
+            info = self.put_chunks(chunks)
+            self.set_ref(key, info)
+        self.link(info['sha512'], destination)
+
+        return info
@@ -0,0 +1,148 @@
+import asyncio
+import glob
+import hashlib
+import json
+import mimetypes
+import mmap
+import os
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from .MIMETypes import mime_types
+
+class SiegfriedCharacterization:
+    output_name = 'siegfried_output.json'
+
+    @staticmethod
+    def _get_command(folder_path):
+        return [
+            '/usr/bin/docker',
+            'run',
+            '--rm',
+            '-v',
+            '%s:%s' % (folder_path, folder_path),
+            '--user',
+            str(os.getuid()),
+            'sfbelaine/common:siegfried_latest',
+            'sf',
+            '-sourceinline',
+            '-json',
+            '-hash',
+            'sha512',
+            '-utc',
+            '-z',
+            folder_path
+        ]
+
+    def _write_output(self, folder, output):
+        jsonfile_name = os.path.join(folder, self.output_name)
+        with open(jsonfile_name, 'wb') as jsonfile:
+            jsonfile.write(output)
+
+        return jsonfile_name
+
+    def characterize(self, folder, manifest=None):
+        folder_path = os.path.abspath(folder)
+        result = subprocess.run(
+            SiegfriedCharacterization._get_command(folder_path),
+            capture_output=True,
+            check=True
+        )
+
+        return self._write_output(folder, result.stdout)
+
+    async def characterize_async(self, folder, manifest=None):
+        # used by AsyncELN2Crate, so that the event loop is not blocked while siegfried runs
+        folder_path = os.path.abspath(folder)
+        command = SiegfriedCharacterization._get_command(folder_path)
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            self._write_output,
+            folder,
+            stdout
+        )
+
+class NativeCharacterization:
+    output_name = 'characterization_output.json'
+
+    def __init__(self, workers=None, mmap_threshold=64*1024*1024):
+        self.workers = workers
+        # files of at least this size are hashed using memory-mapped reads
+        self.mmap_threshold = mmap_threshold
+
+    @staticmethod
+    def get_mime_type(filename):
+        _, filename_ending = os.path.splitext(filename)
+        if mime_types.get(filename_ending.lower()):
+            return mime_types.get(filename_ending.lower())
+
+        return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    def _sha512(self, filename, filesize):
+        with open(filename, 'rb') as datafile:
+            # NOTE: empty files cannot be memory-mapped
+            if filesize < self.mmap_threshold or filesize == 0:
+                return hashlib.sha512(datafile.read()).hexdigest()
+
+            with mmap.mmap(datafile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return hashlib.sha512(data).hexdigest()
+
+    def _characterize_file(self, folder, filename, manifest):
+        filesize = os.path.getsize(filename)
+        # the hash has already been computed if the file has been written by ELN2Crate
+        known = manifest.get_file(os.path.relpath(filename, folder)) if manifest else None
+        if known and known['filesize'] == filesize:
+            sha512 = known['sha512']
+        else:
+            sha512 = self._sha512(filename, filesize)
+
+        return {
+            'filename': filename,
+            'filesize': filesize,
+            'modified': datetime.fromtimestamp(os.path.getmtime(filename), timezone.utc)\
+                .strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'errors': '',
+            'sha512': sha512,
+            'matches': [{
+                'ns': 'mime',
+                'mime': self.get_mime_type(filename)
+            }]
+        }
+
+    def characterize(self, folder, manifest=None):
+        filenames = [
+            filename for filename in glob.glob(os.path.join(folder, '**/*'), recursive=True)
+            if not os.path.isdir(filename)
+        ]
+
+        # hashlib releases the GIL, so threads are sufficient to use several cores
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            files = list(executor.map(
+                lambda filename: self._characterize_file(folder, filename, manifest),
+                filenames
+            ))
+
+        jsonfile_name = os.path.join(folder, self.output_name)
+        with open(jsonfile_name, 'w') as jsonfile:
+            json.dump({
+                'scandate': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'files': files
+            }, jsonfile)
+
+        return jsonfile_name
+
+characterization_backends = {
+    'siegfried': SiegfriedCharacterization,
+    'native': NativeCharacterization
+}
@@ -0,0 +1,288 @@
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .MIMETypes import uncompressed_types
+
+class CrateWriter:
+    def __init__(self, compresslevel=6, uncompressed=None):
+        self.compresslevel = compresslevel
+        # file endings that are stored without compression
+        self.uncompressed = uncompressed_types if uncompressed is None else uncompressed
+
+    def get_compress_type(self, filename):
+        _, filename_ending = os.path.splitext(filename)
+        if filename_ending.lower() in self.uncompressed:
+            return zipfile.ZIP_STORED
+
+        return zipfile.ZIP_DEFLATED
+
+    @staticmethod
+    def iter_folder(folder):
+        # same order as `shutil.make_archive`: first the sub folders, then the files
+        for dirpath, dirnames, filenames in os.walk(folder):
+            arcdirpath = os.path.relpath(dirpath, folder)
+            for name in sorted(dirnames):
+                yield os.path.join(dirpath, name), os.path.normpath(os.path.join(arcdirpath, name))
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if os.path.isfile(path):
+                    yield path, os.path.normpath(os.path.join(arcdirpath, name))
+
+    def _write_entries(self, zip_file, folder, generated):
+        for path, arcname in CrateWriter.iter_folder(folder):
+            if os.path.isdir(path):
+                zip_file.write(path, arcname)
+                continue
+            # NOTE: ZipFile.write copies the file in chunks into the archive
+            zip_file.write(path, arcname, compress_type=self.get_compress_type(arcname))
+
+        for arcname, write_content in generated.items():
+            zip_info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+            zip_info.compress_type = self.get_compress_type(arcname)
+            zip_info.external_attr = 0o644 << 16
+            with zip_file.open(zip_info, 'w', force_zip64=True) as stream:
+                write_content(stream)
+
+    def write(self, folder, target_file, generated=None):
+        # generated maps names inside the archive to functions that write the content
+        # directly into the archive, so that it does not need to be written to disk first
+        tmp_file = target_file + '.tmp'
+        try:
+            with zipfile.ZipFile(tmp_file, 'w', compression=zipfile.ZIP_DEFLATED,
+                                 allowZip64=True, compresslevel=self.compresslevel) as zip_file:
+                self._write_entries(zip_file, folder, generated or {})
+        except:
+            # do not leave an incomplete archive behind
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+
+        # the crate only appears once it has been written completely
+        os.replace(tmp_file, target_file)
+
+        return target_file
+
+# sizes and offsets above this limit require ZIP64 extensions (same limit as `zipfile`)
+ZIP64_LIMIT = (1 << 31) - 1
+CHUNK_SIZE = 1024 * 1024
+
+def _dos_date_time(timestamp):
+    date_time = time.localtime(timestamp)
+    year = max(date_time.tm_year, 1980)
+    return (
+        (year - 1980) << 9 | date_time.tm_mon << 5 | date_time.tm_mday,
+        date_time.tm_hour << 11 | date_time.tm_min << 5 | date_time.tm_sec // 2
+    )
+
+class ParallelCrateWriter(CrateWriter):
+    def __init__(self, compresslevel=6, uncompressed=None, workers=None):
+        super().__init__(compresslevel, uncompressed)
+        # number of threads compressing files at the same time
+        # NOTE: zlib releases the GIL, so threads make use of several cores
+        self.workers = workers
+
+    def _compress_member(self, path, compress_type, spool_folder):
+        crc = 0
+        file_size = 0
+        if compress_type == zipfile.ZIP_STORED:
+            # stored files are copied from their original location later
+            with open(path, 'rb') as source:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    crc = zlib.crc32(chunk, crc)
+                    file_size += len(chunk)
+
+            return {'crc': crc, 'file_size': file_size, 'compress_size': file_size, 'data': path}
+
+        compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15)
+        spool_file, spool_path = tempfile.mkstemp(dir=spool_folder)
+        with open(path, 'rb') as source, os.fdopen(spool_file, 'wb') as target:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                crc = zlib.crc32(chunk, crc)
+                file_size += len(chunk)
+                target.write(compressor.compress(chunk))
+            target.write(compressor.flush())
+            compress_size = target.tell()
+
+        return {'crc': crc, 'file_size': file_size, 'compress_size': compress_size, 'data': spool_path}
+
+    @staticmethod
+    def _write_member(target, arcname, member, compress_type, external_attr, date_time):
+        name = arcname.encode('utf-8')
+        flags = 0x800 if not arcname.isascii() else 0
+        offset = target.tell()
+
+        # local file header
+        zip64 = member['file_size'] > ZIP64_LIMIT or member['compress_size'] > ZIP64_LIMIT
+        extra = struct.pack('<HHQQ', 1, 16, member['file_size'], member['compress_size']) \
+            if zip64 else b''
+        target.write(struct.pack(
+            '<IHHHHHIIIHH',
+            0x04034b50,
+            45 if zip64 else 20,
+            flags,
+            compress_type,
+            date_time[1],
+            date_time[0],
+            member['crc'],
+            0xFFFFFFFF if zip64 else member['compress_size'],
+            0xFFFFFFFF if zip64 else member['file_size'],
+            len(name),
+            len(extra)
+        ))
+        target.write(name)
+        target.write(extra)
+
+        if member.get('data'):
+            with open(member['data'], 'rb') as source:
+                shutil.copyfileobj(source, target, CHUNK_SIZE)
+
+        # the central directory entry is written at the end of the archive
+        zip64_fields = []
+        file_size = member['file_size']
+        compress_size = member['compress_size']
+        header_offset = offset
+        if file_size > ZIP64_LIMIT:
+            zip64_fields.append(file_size)
+            file_size = 0xFFFFFFFF
+        if compress_size > ZIP64_LIMIT:
+            zip64_fields.append(compress_size)
+            compress_size = 0xFFFFFFFF
+        if header_offset > ZIP64_LIMIT:
+            zip64_fields.append(header_offset)
+            header_offset = 0xFFFFFFFF
+        extra = struct.pack('<HH' + 'Q' * len(zip64_fields), 1, 8 * len(zip64_fields),
+                            *zip64_fields) if zip64_fields else b''
+        version = 45 if zip64_fields else 20
+
+        return struct.pack(
+            '<IHHHHHHIIIHHHHHII',
+            0x02014b50,
+            3 << 8 | version, # created on unix
+            version,
+            flags,
+            compress_type,
+            date_time[1],
+            date_time[0],
+            member['crc'],
+            compress_size,
+            file_size,
+            len(name),
+            len(extra),
+            0,
+            0,
+            0,
+            external_attr,
+            header_offset
+        ) + name + extra
+
+    @staticmethod
+    def _write_end_of_central_directory(target, count, central_directory_offset):
+        central_directory_size = target.tell() - central_directory_offset
+        if count > 0xFFFF or central_directory_offset > ZIP64_LIMIT or \
+            central_directory_size > ZIP64_LIMIT:
+            zip64_offset = target.tell()
+            target.write(struct.pack(
+                '<IQHHIIQQQQ',
+                0x06064b50,
+                44,
+                3 << 8 | 45,
+                45,
+                0,
+                0,
+                count,
+                count,
+                central_directory_size,
+                central_directory_offset
+            ))
+            target.write(struct.pack('<IIQI', 0x07064b50, 0, zip64_offset, 1))
+
+        target.write(struct.pack(
+            '<IHHHHIIH',
+            0x06054b50,
+            0,
+            0,
+            min(count, 0xFFFF),
+            min(count, 0xFFFF),
+            min(central_directory_size, 0xFFFFFFFF),
+            min(central_directory_offset, 0xFFFFFFFF),
+            0
+        ))
+
+    def write(self, folder, target_file, generated=None):
+        tmp_file = target_file + '.tmp'
+        spool_folder = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(target_file)))
+        try:
+            # generated content is compressed in parallel as well, so write it to disk first
+            entries = list(CrateWriter.iter_folder(folder))
+            for arcname, write_content in (generated or {}).items():
+                path = os.path.join(spool_folder, 'generated_%i' % (len(entries)))
+                with open(path, 'wb') as stream:
+                    write_content(stream)
+                entries.append((path, arcname))
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor, \
+                open(tmp_file, 'wb') as target:
+                # NOTE: the members are compressed in parallel while map() returns
+                # the results in order of the entries
+                members = executor.map(
+                    lambda entry: None if os.path.isdir(entry[0]) else self._compress_member(
+                        entry[0],
+                        self.get_compress_type(entry[1]),
+                        spool_folder
+                    ),
+                    entries
+                )
+
+                central_directory = []
+                for (path, arcname), member in zip(entries, members):
+                    stat = os.stat(path)
+                    date_time = _dos_date_time(stat.st_mtime)
+                    if member is None:
+                        central_directory.append(ParallelCrateWriter._write_member(
+                            target,
+                            arcname + '/',
+                            {'crc': 0, 'file_size': 0, 'compress_size': 0},
+                            zipfile.ZIP_STORED,
+                            (0o40000 | stat.st_mode & 0xFFFF) << 16 | 0x10,
+                            date_time
+                        ))
+                        continue
+
+                    compress_type = self.get_compress_type(arcname)
+                    central_directory.append(ParallelCrateWriter._write_member(
+                        target,
+                        arcname,
+                        member,
+                        compress_type,
+                        (stat.st_mode & 0xFFFF) << 16,
+                        date_time
+                    ))
+                    if compress_type != zipfile.ZIP_STORED:
+                        os.remove(member['data'])
+
+                central_directory_offset = target.tell()
+                for entry in central_directory:
+                    target.write(entry)
+                ParallelCrateWriter._write_end_of_central_directory(
+                    target,
+                    len(central_directory),
+                    central_directory_offset
+                )
+        except:
+            # do not leave an incomplete archive behind
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        finally:
+            shutil.rmtree(spool_folder)
+
+        os.replace(tmp_file, target_file)
+
+        return target_file
@@ -0,0 +1,105 @@
+import hashlib
+import os
+
+from rdflib import BNode, Literal
+from rdflib.namespace import RDF
+
+from .ELN2Crate import ELN2Crate, get_error_message
+from .GraphStore import iter_subjects
+from .NTriplesWriter import NTriplesWriter
+from .Pseudonymizer import Pseudonymizer
+
+class DatasetBuilder:
+    def __init__(self, logger, namespace_url, elabftw_url, elabftw_manager, pseudonymize_persons,
+                 common_graph=None, **options):
+        self.log = logger
+        self.namespace_url = namespace_url
+        self.elabftw_url = elabftw_url
+        self.elabftw_manager = elabftw_manager
+        # NOTE: all experiments share the same pseudonyms
+        if not isinstance(pseudonymize_persons, Pseudonymizer):
+            pseudonymize_persons = Pseudonymizer(pseudonymize_persons)
+        self.pseudonymizer = pseudonymize_persons
+        # name of the graph that contains the entities shared by the experiments, e.g.,
+        # researchers, institutions, manufacturers and database items
+        self.common_graph = common_graph or namespace_url + '/'
+        # further keyword arguments are handed over to each ELN2Crate instance
+        self.options = options
+        # hashes of the triples that have already been written to the common graph
+        self.common_triples = set()
+
+    @staticmethod
+    def _is_local(writer, model, term, vocab=False):
+        # blank nodes and everything inside the protocol namespace (including the
+        # files of the crate) belong to the experiment
+        if isinstance(term, BNode):
+            return True
+        # NOTE: literals are no IRIs and would otherwise be resolved against the namespace
+        if isinstance(term, Literal):
+            return False
+
+        # types are resolved against the vocabulary like in the N-Triples
+        return writer.resolve(str(term), vocab).startswith(str(model.protocol_namespace))
+
+    def _write_experiment(self, model, stream):
+        experiment_graph = str(model.protocol_namespace)
+        writer = NTriplesWriter(model.graph_context, model.protocol_namespace)
+
+        for subject, predicate_objects in iter_subjects(model.graph):
+            subject_local = DatasetBuilder._is_local(writer, model, subject)
+            lines = []
+            for p, o in predicate_objects:
+                if subject_local or DatasetBuilder._is_local(writer, model, o, p == RDF.type):
+                    lines.append(writer.get_line((subject, p, o), experiment_graph))
+                    continue
+
+                # NOTE: only a short hash of the shared triples is kept, so that the
+                # memory grows with the number of distinct shared triples only
+                triple_hash = hashlib.blake2b(
+                    writer.get_line((subject, p, o)).encode('utf-8'),
+                    digest_size=16
+                ).digest()
+                if triple_hash in self.common_triples:
+                    continue
+                self.common_triples.add(triple_hash)
+                lines.append(writer.get_line((subject, p, o), self.common_graph))
+
+            stream.write(''.join(lines).encode('utf-8'))
+
+    def _add_experiment(self, exp_id, stream):
+        # NOTE: only one experiment is modeled at a time, its temporary files are
+        # removed as soon as it is written
+        model = ELN2Crate(self.log, self.namespace_url, self.elabftw_url, self.elabftw_manager,
+                          exp_id, self.pseudonymizer, **self.options)
+        model.write_files()
+        model.create_model()
+        self._write_experiment(model, stream)
+
+    def build(self, exp_ids, target_file):
+        summary = {
+            'succeeded': [],
+            'failed': {}
+        }
+
+        tmp_file = target_file + '.tmp'
+        with open(tmp_file, 'wb') as stream:
+            for exp_id in exp_ids:
+                try:
+                    self._add_experiment(exp_id, stream)
+                except Exception as e: # pylint: disable=broad-except
+                    error = get_error_message(self.log, exp_id, e)
+                    self.log.error('Experiment %s failed: %s' % (exp_id, error))
+                    summary['failed'][exp_id] = error
+                else:
+                    summary['succeeded'].append(exp_id)
+
+        # the dataset only appears once it has been written completely
+        os.replace(tmp_file, target_file)
+
+        self.log.info('Added %i experiments to %s, %i failed' % (
+            len(summary['succeeded']),
+            target_file,
+            len(summary['failed'])
+        ))
+
+        return summary
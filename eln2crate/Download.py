@@ -0,0 +1,50 @@
+import hashlib
+
+from urllib.parse import urljoin
+
+import requests
+
+CHUNK_SIZE = 1024 * 1024
+
+def iter_upload(elabftw_manager, upload_id, chunk_size=CHUNK_SIZE):
+    # managers can provide their own streaming implementation
+    if hasattr(elabftw_manager, 'iter_upload'):
+        yield from elabftw_manager.iter_upload(upload_id, chunk_size)
+        return
+
+    # `elabapy.Manager.get_upload` returns the complete response content, so we
+    # re-use its connection settings in order to stream the upload instead
+    endpoint = getattr(elabftw_manager, 'endpoint', None)
+    token = getattr(elabftw_manager, 'token', None)
+    if endpoint and token:
+        with requests.get(
+                urljoin(endpoint, 'uploads/%s' % (upload_id)),
+                headers={'Authorization': token},
+                verify=getattr(elabftw_manager, 'verify', True),
+                stream=True
+            ) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+        return
+
+    data = memoryview(elabftw_manager.get_upload(upload_id))
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+def write_chunks(chunks, path):
+    # write the file and compute its size and hash in the same pass
+    sha512 = hashlib.sha512()
+    size = 0
+    with open(path, 'wb') as datafile:
+        for chunk in chunks:
+            datafile.write(chunk)
+            sha512.update(chunk)
+            size += len(chunk)
+
+    return {
+        'filesize': size,
+        'sha512': sha512.hexdigest()
+    }
+
+def write_text(text, path):
+    return write_chunks([text.encode('utf-8')], path)
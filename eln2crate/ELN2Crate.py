@@ -1,45 +1,108 @@
 import copy
 import glob
+import hashlib
 import json
 import os
 import re
 import shutil
-import subprocess
-import sys
 import tempfile
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from urllib import parse
 
-from bs4 import BeautifulSoup
 from bs4 import element as BeautifulSoup_element
-from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib import Graph, Literal, Namespace, URIRef
 from rdflib.namespace import FOAF, OWL, RDF, RDFS, XSD
 from pathvalidate import sanitize_filename
 
 from .Activities import activities
+from .Characterization import characterization_backends
+from .CrateWriter import CrateWriter
+from .Download import CHUNK_SIZE, iter_upload, write_chunks, write_text
+from .FileManifest import FileManifest
+from .GraphStore import SQLiteStore
+from .HTMLParsing import parse_html, parse_item_table, serialize_html
 from .IDGenerator import IDGenerator
+from .Instrumentation import Instrumentation
+from .ItemRegistry import ItemRegistry
+from .JSONLDWriter import JSONLDWriter
+from .KeywordMatcher import KeywordMatcher
 from .Manufacturers import manufacturers
+from .MixtureRegistry import MixtureRegistry
+from .NTriplesWriter import NTriplesWriter
 from .MIMETypes import mime_types
 from .Persons import persons, institutions
+from .Pseudonymizer import Pseudonymizer
+from .Snapshot import SnapshotManager
 from .Templates import templates
+from .Units import unit_groups, unit_pattern, units
+from .Vocabulary import Bfo, Custom, Foaf, OBO, Prov, Schema
+
+activity_matcher = KeywordMatcher(activities.keys())
+# the IRIs of the activities are created only once
+activity_ids = {indicator: URIRef(activity) for indicator, activity in activities.items()}
+manufacturer_matcher = KeywordMatcher(manufacturers.keys())
 
 class ProtocolElementUnknown(Exception):
     pass
 
+def get_error_message(logger, exp_id, error):
+    # message of a failed conversion in the summary of a batch or a dataset
+    # NOTE: has to be called while handling the error, so that the traceback is logged
+    if isinstance(error, ProtocolElementUnknown):
+        return 'Protocol element is unknown: ' + str(error)
+
+    logger.exception('Conversion of experiment %s failed' % (exp_id))
+    return '%s: %s' % (type(error).__name__, error)
+
 class ELN2Crate:
-    def __init__(self, logger, namespace_url, elabftw_url, elabftw_manager, exp_id, pseudonymize_persons):
+    def __init__(self, logger, namespace_url, elabftw_url, elabftw_manager, exp_id, pseudonymize_persons,
+                 fetch_workers=4, download_chunk_size=CHUNK_SIZE, item_cache=None,
+                 characterization='siegfried', blob_store=None, crate_writer=None,
+                 html_parser=None, graph_store='memory', instrumentation=None):
         self.log = logger
         self.elabftw_url = elabftw_url
         self.elabftw_manager = elabftw_manager
+        # maximum number of concurrent requests sent to elabFTW
+        self.fetch_workers = fetch_workers
+        self.download_chunk_size = download_chunk_size
+        # optional ItemCache in order to not download unchanged database items again
+        self.item_cache = item_cache
+        # either a key of `characterization_backends` or a backend instance
+        if isinstance(characterization, str):
+            characterization = characterization_backends[characterization]()
+        self.characterization = characterization
+        # optional BlobStore that keeps uploads and database items for all crates
+        self.blob_store = blob_store
+        self.crate_writer = crate_writer or CrateWriter()
+        # BeautifulSoup parser, html.parser is used by default
+        self.html_parser = html_parser
+        # information about all files of the crate, indexed by relative path
+        self.manifest = FileManifest()
         self.tempfolder = tempfile.mkdtemp()
-        self.pseudonymize_persons = pseudonymize_persons
-        self._get_experiment_information(exp_id)
+        # either a list of names or a Pseudonymizer that is shared by several experiments
+        if not isinstance(pseudonymize_persons, Pseudonymizer):
+            pseudonymize_persons = Pseudonymizer(pseudonymize_persons)
+        self.pseudonymizer = pseudonymize_persons
+        # timing and counters of the conversion phases
+        self.instrumentation = instrumentation or Instrumentation()
+        with self.instrumentation.phase('fetch'):
+            self._get_experiment_information(exp_id)
         self.general_namespace = Namespace(namespace_url + '/')
         self.protocol_namespace = Namespace('%s/%s/' % (namespace_url, self.exp['id']))
-        self.id_generator = IDGenerator(self.general_namespace, self.protocol_namespace)
-        self.graph = Graph()
+        self.id_generator = IDGenerator(
+            self.general_namespace,
+            self.protocol_namespace,
+            'exp%s' % (self.exp['id'])
+        )
+        # either 'memory', 'sqlite' or an rdflib Store instance
+        if graph_store == 'sqlite':
+            graph_store = SQLiteStore()
+        self.graph = Graph(store='default' if graph_store == 'memory' else graph_store)
+        # mixtures and plans that have already been added to the graph
+        self.mixture_registry = MixtureRegistry()
         self.graph_context = [
             'https://w3id.org/ro/crate/1.1/context',
             {
@@ -53,6 +116,16 @@ class ELN2Crate:
                 'prov': 'http://www.w3.org/ns/prov#'
             }
         ]
+        # writes the graph in the flattened form of RO-Crate without rdflib-jsonld
+        self.json_ld_writer = JSONLDWriter(self.graph_context)
+
+    @classmethod
+    def from_snapshot(cls, logger, namespace_url, elabftw_url, snapshot_path, exp_id,
+                      pseudonymize_persons, **options):
+        # converts an experiment that has been saved by `SnapshotExporter` without
+        # connecting to elabFTW
+        return cls(logger, namespace_url, elabftw_url, SnapshotManager(snapshot_path), exp_id,
+                   pseudonymize_persons, **options)
 
     @staticmethod
     def create_folder_if_not_exists(folder):
@@ -65,20 +138,20 @@ class ELN2Crate:
                 continue
 
             item_id = link.get('href').split('&')[1].replace('id=', '')
-            for item in self.items:
-                if item['id'] == item_id:
-                    link['href'] = 'Database/%s.html' % (
-                        sanitize_filename('%s - %s' % (item['category'], item['title']))
-                    )
-                    link['target'] = '_blank'
-                    # also update the item so that we can re-use the link for
-                    # matching the item later:
-                    item['ro-crate_link'] = link['href']
+            for item in self.item_registry.get_items_by_id(item_id):
+                link['href'] = 'Database/%s' % (self.item_registry.get_filename(item))
+                link['target'] = '_blank'
+                # also update the item so that we can re-use the link for
+                # matching the item later:
+                self.item_registry.set_link(item, link['href'])
 
     def write_files(self):
-        self._write_experiment_body()
-        self._write_database_items()
-        self._write_attachments()
+        with self.instrumentation.phase('write_experiment_body'):
+            self._write_experiment_body()
+        with self.instrumentation.phase('write_database_items'):
+            self._write_database_items()
+        with self.instrumentation.phase('write_attachments'):
+            self._write_attachments()
 
     def _write_experiment_body(self):
         filename = sanitize_filename(self.exp['title']) + '.html'
@@ -86,75 +159,118 @@ class ELN2Crate:
         ELN2Crate.create_folder_if_not_exists(protocol_path)
 
         self._update_protocol_links_to_local()
-        with open(os.path.join(protocol_path, filename), 'w') as file:
-            file.write(str(self.exp['soup']))
+        self.manifest.add_file(
+            os.path.join('Protocol', filename),
+            write_text(
+                serialize_html(self.exp['soup'], self.exp['body']),
+                os.path.join(protocol_path, filename)
+            )
+        )
 
     def _write_database_items(self):
         database_path = os.path.join(self.tempfolder, 'Protocol/Database')
         ELN2Crate.create_folder_if_not_exists(database_path)
 
         for item in self.items:
-            filename = sanitize_filename('%s - %s' % (item['category'], item['title'])) + '.html'
-            with open(os.path.join(database_path, filename), 'w') as file:
-                file.write(item['body'])
+            filename = self.item_registry.get_filename(item)
+            if self.blob_store:
+                info = self.blob_store.write_text(item['body'], os.path.join(database_path, filename))
+            else:
+                info = write_text(item['body'], os.path.join(database_path, filename))
+            self.manifest.add_file(os.path.join('Protocol/Database', filename), info)
 
     def _write_attachments(self):
         attachment_path = os.path.join(self.tempfolder, 'Data')
         ELN2Crate.create_folder_if_not_exists(attachment_path)
 
-        for upload in self.exp.get('uploads'):
-            complete_name = os.path.join(attachment_path, upload['real_name'])
-            with open(complete_name, 'wb') as datafile:
-                datafile.write(self.elabftw_manager.get_upload(upload['id']))
+        # NOTE: uploads with the same name would be written concurrently into the same file,
+        # so only the last of them is written (as the crate contains a single file anyway)
+        uploads = {upload['real_name']: upload for upload in self.exp.get('uploads')}
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            # consume the results in order to propagate exceptions of the workers
+            list(executor.map(
+                lambda upload: self._write_attachment(attachment_path, upload),
+                uploads.values()
+            ))
+
+    def _write_attachment(self, attachment_path, upload):
+        # stream the upload to disk in order to not keep large files in memory
+        complete_name = os.path.join(attachment_path, upload['real_name'])
+        chunks = self.instrumentation.count_chunks(
+            'bytes_downloaded',
+            iter_upload(self.elabftw_manager, upload['id'], self.download_chunk_size)
+        )
+        if self.blob_store:
+            # NOTE: the upload is only downloaded if it is not in the store yet
+            info = self.blob_store.write_upload(
+                'upload/%s/%s' % (upload['id'], upload['datetime']),
+                chunks,
+                complete_name
+            )
+        else:
+            info = write_chunks(chunks, complete_name)
+        self.manifest.add_file(os.path.join('Data', upload['real_name']), info)
 
     def _get_experiment_information(self, exp_id):
         self.exp = self.elabftw_manager.get_experiment(exp_id)
         # Pseudonymize persons
-        for i, name in enumerate(self.pseudonymize_persons):
-            self.exp['body'] = self.exp['body'].replace(name, 'Anonymous Person%d' % (i+1))
-        self.exp['soup'] = BeautifulSoup(self.exp['body'], 'html.parser')
+        self.exp['body'] = self.pseudonymizer.pseudonymize(self.exp['body'])
+        for upload in self.exp.get('uploads'):
+            upload['real_name'] = self.pseudonymizer.pseudonymize(upload['real_name'])
+        self.exp['soup'] = parse_html(self.exp['body'], self.html_parser)
+        self._pseudonymize_download_links()
+        self.manifest.add_uploads(self.exp.get('uploads'))
         self._get_database_items()
+        self.item_registry = ItemRegistry(self.items)
+        self.instrumentation.count('items', len(self.items))
+        self.instrumentation.count('uploads', len(self.exp.get('uploads')))
+
+    def _pseudonymize_download_links(self):
+        # the names of the uploads inside the links of the exported protocol
+        for link in self.exp['soup'].find_all('a', href=True):
+            if link['href'].startswith('app/download.php'):
+                link['href'] = self.pseudonymizer.pseudonymize_link(link['href'])
 
     def _get_database_items(self):
-        self.items = []
         # Note: we assume that all items linked in the text appear also in the links
         # at the end of the protocol in order to ensure this, run `updating_links.ipynb`
-        for item in self.exp.get('links'):
-            self.items.append(self.elabftw_manager.get_item(item['itemid']))
-
-    def _call_siegfried(self):
-        folder_path = os.path.abspath(self.tempfolder)
-        result = subprocess.run(' '.join([
-            '/usr/bin/docker',
-            'run',
-            '--rm',
-            '-v',
-            '%s:%s' % (folder_path, folder_path),
-            '--user',
-            '$(id -u)',
-            'sfbelaine/common:siegfried_latest',
-            'sf',
-            '-sourceinline',
-            '-json',
-            '-hash',
-            'sha512',
-            '-utc',
-            '-z',
-            folder_path
-        ]), capture_output=True, shell=True, check=True)
-
-        jsonfile_name = os.path.join(self.tempfolder, 'siegfried_output.json')
-        with open(jsonfile_name, 'wb') as jsonfile:
-            jsonfile.write(result.stdout)
-
-        return jsonfile_name
+        # NOTE: map() keeps the order of the links, independent of the response times
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            self.items = list(executor.map(
+                self._get_database_item,
+                [item['itemid'] for item in self.exp.get('links')]
+            ))
+
+    def _get_database_item(self, item_id):
+        if self.item_cache:
+            item = self.item_cache.get_item(self.elabftw_manager, item_id)
+        else:
+            item = self.elabftw_manager.get_item(item_id)
+        item['body'] = self.pseudonymizer.pseudonymize(item['body'])
+
+        return item
+
+    def _characterize_files(self):
+        return self.characterization.characterize(self.tempfolder, self.manifest)
 
     def create_model(self):
-        self.sf_output = self._call_siegfried()
-        self._model_items()
-        self._model_protocol()
-        self._model_rocrate_base()
-        self._model_attachments()
+        with self.instrumentation.phase('characterize'):
+            self.sf_output = self._characterize_files()
+            self.manifest.load_characterization(self.sf_output, self.tempfolder)
+
+        return self._build_model()
+
+    def _build_model(self):
+        # NOTE: requires the characterization of the files
+        with self.instrumentation.phase('model_items'):
+            self._model_items()
+        with self.instrumentation.phase('model_protocol'):
+            self._model_protocol()
+        with self.instrumentation.phase('model_rocrate_base'):
+            self._model_rocrate_base()
+        with self.instrumentation.phase('model_attachments'):
+            self._model_attachments()
+        self.instrumentation.count('triples', len(self.graph))
 
         return self.graph
 
@@ -170,61 +286,55 @@ class ELN2Crate:
             _, filename_ending = os.path.splitext(filename_base)
             graph_id = self.id_generator.getFile(filename_clean)
             self.graph.add((graph_id, FOAF.name, Literal(filename_clean, lang='en')))
-            self.graph.add((graph_id, RDF.type, URIRef('File')))
+            self.graph.add((graph_id, RDF.type, Schema.File))
             self.graph.add((
                 graph_id,
-                URIRef('encodingFormat'),
+                Schema.encodingFormat,
                 Literal(mime_types.get(filename_ending))
             ))
 
-            self.graph.add((self.graph_dir, URIRef('hasPart'), graph_id))
+            self.graph.add((self.graph_dir, Schema.hasPart, graph_id))
 
             # siegfried output should be added, but don't cover further reasoning
-            if filename_base == 'siegfried_output.json':
+            if filename_base == os.path.basename(self.sf_output):
                 # add siegfried meta data
-                with open(self.sf_output) as data_file:
-                    data = json.load(data_file)
-                    # 2021-04-12T09:21:53Z
-                    lastchange = datetime.strptime(data['scandate'], '%Y-%m-%dT%H:%M:%SZ')
-                    self.graph.add((
-                        graph_id,
-                        URIRef('https://schema.org/dateModified'),
-                        Literal(lastchange, datatype=XSD.dateTime)
-                    ))
-                    # the following information will be skipped for now
-                    #self.graph.add((graph_id, URIRef('siegfried'), Literal(data['siegfried'])))
-                    #self.graph.add((graph_id, URIRef('signature'), Literal(data['signature'])))
-                    #self.graph.add((graph_id, URIRef('created'), Literal(data['created'])))
-                    #self.graph.add((
-                    #    graph_id,
-                    #    URIRef('identifiers'),
-                    #    Literal(json.dumps(data['identifiers']))
-                    # ))
+                self.graph.add((
+                    graph_id,
+                    Schema.dateModified,
+                    Literal(self.manifest.scandate, datatype=XSD.dateTime)
+                ))
+                # the following information will be skipped for now
+                #self.graph.add((graph_id, URIRef('siegfried'), Literal(data['siegfried'])))
+                #self.graph.add((graph_id, URIRef('signature'), Literal(data['signature'])))
+                #self.graph.add((graph_id, URIRef('created'), Literal(data['created'])))
+                #self.graph.add((
+                #    graph_id,
+                #    URIRef('identifiers'),
+                #    Literal(json.dumps(data['identifiers']))
+                # ))
                 continue
 
             # check if additional information are inside elabFTW
             # Data folder contains uploads only, so we can rely on the file name
-            if os.path.basename(filename_dir) == 'Data':
-                for upload in self.exp.get('uploads'):
-                    if upload['real_name'] == filename_base:
-                        lastchange = datetime.strptime(upload['datetime'], '%Y-%m-%d %H:%M:%S')
-                        self.graph.add((
-                            graph_id,
-                            URIRef('https://schema.org/dateModified'),
-                            Literal(lastchange, datatype=XSD.dateTime)
-                        ))
-                        # Disable this as it allows anybody to download the file
-                        # download_url = '%s/app/download.php?f=%s&name=%s&forceDownload' % (
-                        #     self.elabftw_url,
-                        #     upload['long_name'],
-                        #     upload['real_name']
-                        # )
-                        # self.graph.add((
-                        #     graph_id,
-                        #     URIRef('url'),
-                        #     Literal(download_url, datatype=XSD.anyUri)
-                        # ))
-                        break
+            upload = self.manifest.get_upload(filename_base)
+            if os.path.basename(filename_dir) == 'Data' and upload:
+                lastchange = datetime.strptime(upload['datetime'], '%Y-%m-%d %H:%M:%S')
+                self.graph.add((
+                    graph_id,
+                    Schema.dateModified,
+                    Literal(lastchange, datatype=XSD.dateTime)
+                ))
+                # Disable this as it allows anybody to download the file
+                # download_url = '%s/app/download.php?f=%s&name=%s&forceDownload' % (
+                #     self.elabftw_url,
+                #     upload['long_name'],
+                #     upload['real_name']
+                # )
+                # self.graph.add((
+                #     graph_id,
+                #     URIRef('url'),
+                #     Literal(download_url, datatype=XSD.anyUri)
+                # ))
 
             ###################################################################
             # NOTE: We don't add modification date and URLs for Protocol and Database Items
@@ -271,26 +381,22 @@ class ELN2Crate:
             #             break
             ###################################################################
 
-            # check if we find corresponding match from siegefried outout
-            with open(self.sf_output) as data_file:
-                data = json.load(data_file)
-
-                for metadata in data['files']:
-                    if filename == metadata['filename'].replace('/tmp/siegfried-files/', ''):
-                        self.graph.add((
-                            graph_id,
-                            URIRef('contentSize'),
-                            Literal(metadata['filesize'])
-                        ))
-                        self.graph.add((graph_id, URIRef('sha512'), Literal(metadata['sha512'])))
-                        # Skip the following information from siegfried for now
-                        # self.graph.add((
-                        #     graph_id,
-                        #     URIRef('matches'),
-                        #     Literal(json.dumps(metadata['matches']))
-                        # ))
-                        # self.graph.add((graph_id, URIRef('errors'), Literal(metadata['errors'])))
-                        break
+            # size and hash either from writing the file or from the characterization
+            metadata = self.manifest.get_file(filename_clean)
+            if metadata:
+                self.graph.add((
+                    graph_id,
+                    Schema.contentSize,
+                    Literal(metadata['filesize'])
+                ))
+                self.graph.add((graph_id, Schema.sha512, Literal(metadata['sha512'])))
+                # Skip the following information from siegfried for now
+                # self.graph.add((
+                #     graph_id,
+                #     URIRef('matches'),
+                #     Literal(json.dumps(metadata['matches']))
+                # ))
+                # self.graph.add((graph_id, URIRef('errors'), Literal(metadata['errors'])))
 
 
     def _model_items(self):
@@ -298,7 +404,7 @@ class ELN2Crate:
         for item in self.items:
             graph_item = self.id_generator.getDBItem(item)
             self.graph.add((graph_item, FOAF.name, Literal(item['title'], lang='en')))
-            self.graph.add((graph_item, RDF.type, URIRef('IndividualProduct')))
+            self.graph.add((graph_item, RDF.type, Schema.IndividualProduct))
             # TODO: the following might be integrated in order to reference the internal category
             # self.graph.add((graph_item, URIRef('category'), Literal(item['category'], lang='en')))
 
@@ -306,7 +412,7 @@ class ELN2Crate:
             lastchange = datetime.strptime(item['lastchange'], '%Y-%m-%d %H:%M:%S')
             self.graph.add((
                 graph_item,
-                URIRef('https://schema.org/dateModified'),
+                Schema.dateModified,
                 Literal(lastchange, datatype=XSD.dateTime)
             ))
             # disable the database url for now
@@ -321,12 +427,14 @@ class ELN2Crate:
             # ))
             self.graph.add((
                 graph_item,
-                URIRef('hasFile'),
-                self.id_generator.getFile(os.path.join('Protocol/', item['ro-crate_link']))
+                Schema.hasFile,
+                self.id_generator.getFile(
+                    os.path.join('Protocol/', self.item_registry.get_link(item))
+                )
             ))
 
             # now, try to find item types and wikidata items
-            item['soup'] = BeautifulSoup(item['body'], 'html.parser')
+            item['soup'] = parse_item_table(item['body'], self.html_parser)
             table = item['soup'].find('table')
             assigned = False
             if table:
@@ -355,7 +463,7 @@ class ELN2Crate:
                             row.contents[3].text.strip().lower())
                         self.graph.add((
                             graph_item,
-                            URIRef('http://purl.obolibrary.org/obo/OBI_0000647'), # has supplier
+                            OBO.has_supplier,
                             manufacturer_id
                         ))
                         continue
@@ -364,7 +472,7 @@ class ELN2Crate:
                         ['manufacturer', 'supplier', 'developer']]:
                         self.graph.add((
                             graph_item,
-                            URIRef('has_supplier_id'), # FIXME: define custom relation
+                            Custom.has_supplier_id,
                             Literal(row.contents[3].text.strip())
                         ))
                         continue
@@ -386,164 +494,98 @@ class ELN2Crate:
     def _model_rocrate_base(self):
         graph_base = URIRef('ro-crate-metadata.json')
         self.graph_dir = self.id_generator.getDataset()
-        self.graph.add((graph_base, RDF.type, URIRef('CreativeWork')))
+        self.graph.add((graph_base, RDF.type, Schema.CreativeWork))
         self.graph.add((
             graph_base,
-            URIRef('conformsTo'),
+            Schema.conformsTo,
             URIRef('https://w3id.org/ro/crate/1.1')
         ))
-        self.graph.add((graph_base, URIRef('about'), self.graph_dir))
+        self.graph.add((graph_base, Schema.about, self.graph_dir))
 
-        self.graph.add((self.graph_dir, RDF.type, URIRef('Dataset')))
-        self.graph.add((self.graph_dir, URIRef('creator'), self.researcher_id))
+        self.graph.add((self.graph_dir, RDF.type, Schema.Dataset))
+        self.graph.add((self.graph_dir, Schema.creator, self.researcher_id))
         for tag in self.exp['tags'].split('|'):
-            self.graph.add((self.graph_dir, URIRef('keywords'), Literal(tag, lang='en')))
+            self.graph.add((self.graph_dir, Schema.keywords, Literal(tag, lang='en')))
         self.graph.add((
             self.graph_dir,
-            URIRef('name'),
+            Schema.name,
             Literal(self.exp['title'], lang='en')
         ))
         lastchange = datetime.strptime(self.exp['lastchange'], '%Y-%m-%d %H:%M:%S')
         self.graph.add((
             self.graph_dir,
-            URIRef('datePublished'),
+            Schema.datePublished,
             Literal(lastchange, datatype=XSD.dateTime)
         ))
 
         # FIXME: adjust to corresponding license
         license_id = URIRef('https://creativecommons.org/licenses/by/4.0/')
-        self.graph.add((self.graph_dir, URIRef('license'), license_id))
-        self.graph.add((license_id, RDF.type, URIRef('CreativeWork')))
+        self.graph.add((self.graph_dir, Schema.license, license_id))
+        self.graph.add((license_id, RDF.type, Schema.CreativeWork))
         self.graph.add((
             license_id,
-            URIRef('name'),
+            Schema.name,
             Literal('Attribution 4.0 International (CC BY 4.0)', lang='en')
         ))
-        self.graph.add((license_id, URIRef('identifier'), license_id))
+        self.graph.add((license_id, Schema.identifier, license_id))
         self.graph.add((
             license_id,
-            URIRef('description'),
+            Schema.description,
             Literal('This work is licensed under a Creative Commons Attribution 4.0 International License.', lang='en')
         ))
 
     def _model_manufacturer(self, manufacturer_name):
-        for manufacturer_key in manufacturers.keys():
-            if manufacturer_key in manufacturer_name:
-                manufacturer_info = manufacturers[manufacturer_key]
-                manufacturer_id = self.id_generator.getManufacturer(manufacturer_key, manufacturer_info)
+        manufacturer_key = manufacturer_matcher.find_first(manufacturer_name)
+        if manufacturer_key:
+            manufacturer_info = manufacturers[manufacturer_key]
+            manufacturer_id = self.id_generator.getManufacturer(manufacturer_key, manufacturer_info)
 
-                self.graph.add((
-                    manufacturer_id,
-                    FOAF.name,
-                    Literal(manufacturer_info['name'])
-                ))
+            self.graph.add((
+                manufacturer_id,
+                FOAF.name,
+                Literal(manufacturer_info['name'])
+            ))
 
-                self.graph.add((
-                    manufacturer_id,
-                    RDF.type,
-                    URIRef('http://purl.obolibrary.org/obo/OBI_0000835') # manufacturer
-                ))
+            self.graph.add((
+                manufacturer_id,
+                RDF.type,
+                OBO.manufacturer
+            ))
 
-                return manufacturer_id
+            return manufacturer_id
 
         self.log.error('Could not find manufacturer name: "%s"' % (manufacturer_name))
-        sys.exit(1)
+        raise ProtocolElementUnknown('manufacturer "%s"' % (manufacturer_name))
 
     def _add_parameter_nodes(self, step_id, value_specification, label, value, unit):
-        node_id = BNode()
+        node_id = self.id_generator.getBlankNode()
         self.graph.add((node_id, RDF.type, value_specification))
         self.graph.add((node_id, RDFS.label, label))
-        self.graph.add((node_id, URIRef('prov:value'), value))
+        self.graph.add((node_id, Prov.value, value))
         self.graph.add((
             node_id,
-            URIRef('http://purl.obolibrary.org/obo/IAO_0000039'), # has measurement unit label
+            OBO.has_measurement_unit_label,
             unit
         ))
         self.graph.add((
             step_id,
-            URIRef('http://purl.obolibrary.org/obo/OBI_0001938'), # has value specification
+            OBO.has_value_specification,
             node_id
         ))
 
 
     def _model_parameters(self, step_id, description):
-        # TEMPERATURE
-        for temperature_search in re.finditer(r'[+-]?[\.\d]+\s*°\s*C', description):
-            temperature = temperature_search.group()
-
-            if re.search(r'°\s*C', temperature):
-                self._add_parameter_nodes(
-                    step_id,
-                    URIRef('http://purl.obolibrary.org/obo/OBI_0002138'),
-                    Literal(temperature),
-                    Literal(
-                        re.match(r'[+-]?[\.\d]+', temperature.strip()).group(),
-                        datatype=XSD.decimal
-                    ),
-                    URIRef('http://purl.obolibrary.org/obo/UO_0000027') # degree Celsius
-                )
-            else:
-                self.log.error('Temperature uses unknown unit: '+ temperature)
-                sys.exit(1)
-
-        # FREQUENCY
-        for frequency_search in re.finditer(r'[+-]?[\.\d]+\s*Hz', description):
-            frequency = frequency_search.group()
-
-            if re.search(r'Hz', frequency):
-                self._add_parameter_nodes(
-                    step_id,
-                    URIRef('http://purl.obolibrary.org/obo/OBI_0001931'),
-                    Literal(frequency),
-                    Literal(
-                        re.match(r'[+-]?[\.\d]+', frequency.strip()).group(),
-                        datatype=XSD.decimal
-                    ),
-                    URIRef('http://purl.obolibrary.org/obo/UO_0000106') # degree Celsius
-                )
-            else:
-                self.log.error('frequency uses unknown unit: '+ frequency)
-                sys.exit(1)
-
-        # DURATION
-        for duration_search in re.finditer(r'[+-]?[\.\d]+\s*(min|ms)', description):
-            duration = duration_search.group()
-
-            duration_unit = None
-            if re.search(r'min', duration):
-                duration_unit = URIRef('http://purl.obolibrary.org/obo/UO_0000031') # minute
-            elif re.search(r'ms', duration):
-                duration_unit = URIRef('http://purl.obolibrary.org/obo/UO_0000028') # millisecond
-            else:
-                self.log.error('Duration uses unknown unit: '+ duration)
-                sys.exit(1)
-
+        # temperature, frequency, duration, voltage, ...
+        for parameter_search in unit_pattern.finditer(description):
+            unit = units[unit_groups[parameter_search.lastgroup]]
             self._add_parameter_nodes(
                 step_id,
-                URIRef('http://purl.obolibrary.org/obo/OBI_0001931'),
-                Literal(duration),
-                Literal(re.match(r'[+-]?[\.\d]+', duration.strip()).group(), \
-                    datatype=XSD.nonNegativeInteger),
-                duration_unit
+                unit['value_specification'],
+                Literal(parameter_search.group()),
+                Literal(parameter_search.group('value'), datatype=unit['datatype']),
+                unit['unit']
             )
 
-        # VOLTAGE
-        for voltage_search in re.finditer(r'[+-]?[\.\d]+\s*V', description):
-            voltage = voltage_search.group()
-
-            if re.search(r'V', voltage):
-                self._add_parameter_nodes(
-                    step_id,
-                    URIRef('http://purl.obolibrary.org/obo/OBI_0001931'),
-                    Literal(voltage),
-                    Literal(re.match(r'[+-]?[\.\d]+', voltage.strip()).group(), \
-                        datatype=XSD.nonNegativeInteger),
-                    URIRef('http://purl.obolibrary.org/obo/UO_0000218') # V
-                )
-            else:
-                self.log.error('Voltage uses unknown unit: '+ voltage)
-                sys.exit(1)
-
 
     def _model_researcher(self, researcher_name):
         if persons.get(researcher_name):
@@ -555,45 +597,45 @@ class ELN2Crate:
             )
             researcher_id = self.id_generator.getResearcher(researcher_name, researcher)
 
-            if (researcher_id, RDF.type, URIRef('prov:Person')) in self.graph:
+            if (researcher_id, RDF.type, Prov.Person) in self.graph:
                 return researcher_id, organization_id
 
-            if (organization_id, RDF.type, URIRef('prov:Organization')) not in self.graph:
-                self.graph.add((organization_id, RDF.type, URIRef('prov:Organization')))
+            if (organization_id, RDF.type, Prov.Organization) not in self.graph:
+                self.graph.add((organization_id, RDF.type, Prov.Organization))
                 self.graph.add((
                     organization_id,
-                    URIRef('foaf:name'),
+                    Foaf.name,
                     Literal(organization['name'], lang='en')
                 ))
 
-            self.graph.add((researcher_id, RDF.type, URIRef('prov:Person')))
+            self.graph.add((researcher_id, RDF.type, Prov.Person))
             self.graph.add((
                 researcher_id,
-                URIRef('foaf:name'),
+                Foaf.name,
                 Literal("%s %s" % (researcher['givenName'], researcher['familyName']), \
                     datatype=XSD.string)
             ))
             self.graph.add((
                 researcher_id,
-                URIRef('foaf:givenName'),
+                Foaf.givenName,
                 Literal(researcher['givenName'], datatype=XSD.string)
             ))
             self.graph.add((
                 researcher_id,
-                URIRef('foaf:familyName'),
+                Foaf.familyName,
                 Literal(researcher['familyName'], datatype=XSD.string)
             ))
             # self.graph.add((researcher_id, URIRef('identifier'), researcher_id))
             if researcher.get('email'):
                 self.graph.add((
                     researcher_id,
-                    URIRef('email'),
+                    Schema.email,
                     Literal(researcher['email'])
                 ))
-            self.graph.add((researcher_id, URIRef('affiliation'), organization_id))
+            self.graph.add((researcher_id, Schema.affiliation, organization_id))
         else:
             self.log.error('Could not find researcher name: "%s"' % (researcher_name))
-            sys.exit(1)
+            raise ProtocolElementUnknown('researcher "%s"' % (researcher_name))
 
         return researcher_id, organization_id
 
@@ -608,12 +650,11 @@ class ELN2Crate:
 
         for link in element.find_all('a'):
             if link['href'].startswith('Database'):
-                for item in self.items:
-                    if item['ro-crate_link'] == link['href']:
-                        count_links += 1
-                        tmp_items.append(item)
-                        current_items.append(self.id_generator.getDBItem(item))
-                        break
+                item = self.item_registry.get_by_link(link['href'])
+                if item:
+                    count_links += 1
+                    tmp_items.append(item)
+                    current_items.append(self.id_generator.getDBItem(item))
 
         # check for LOT number, passage number and attributions
         # NOTE: we assume that in a single list item there is maximum one of each:
@@ -648,18 +689,18 @@ class ELN2Crate:
                     # now add LOT-specific infos
                     self.graph.add((
                         medium_id,
-                        URIRef('has_lot_number'), # FIXME: define custom relation
+                        Custom.has_lot_number,
                         Literal(lot_search.group(), lang='en')
                     ))
                     self.graph.add((
                         medium_id,
-                        URIRef('is_instance_of'), # FIXME: define custom relation
+                        Custom.is_instance_of,
                         db_id
                     ))
                     if passage_search:
                         self.graph.add((
                             medium_id,
-                            URIRef('has_passage_number'), # FIXME: define custom relation
+                            Custom.has_passage_number,
                             Literal(passage_search.group(), lang='en')
                         ))
 
@@ -677,7 +718,7 @@ class ELN2Crate:
                 if len(concentration_search) != count_links:
                     self.log.error('Found more percentages than database items in mixture "%s"' % \
                         (element.text))
-                    sys.exit(1)
+                    raise ProtocolElementUnknown(element.text)
 
                 # create plan specification
                 # check if it does not exists
@@ -694,49 +735,26 @@ class ELN2Crate:
                         concentration_search[idx],
                         item['title']
                     )
-                # find new medium number that is not already in the graph unless we find
-                medium_number = 1
-                found_existing = False
-                while True:
-                    medium_id = self.id_generator.getMixture(medium_name, medium_number)
-                    medium_creating_id = self.id_generator.getMixtureCreating(medium_name,\
-                        medium_number)
-                    if (medium_id, RDF.type, URIRef('http://purl.obolibrary.org/obo/OBI_0302729')) not in self.graph:
-                        break
-                    # if the medium is attributed to this researcher
-                    # OR
-                    # if the medium is not attributed at all and there is no researcher
-                    # THEN: use the current one
-                    if (attributed_search and \
-                        (medium_id, URIRef('prov:wasAttributedTo'), researcher_id) in self.graph) or \
-                        (not attributed_search and \
-                            (medium_id, URIRef('prov:wasAttributedTo'), None) not in self.graph):
-                        # stop here, as we can re-use the medium_id
-                        found_existing = True
-                        break
-
-                    medium_number += 1
+                # re-use an existing mixture or get the next free number
+                medium_number, found_existing = self.mixture_registry.get_mixture(
+                    medium_name,
+                    researcher_id if attributed_search else None
+                )
+                medium_id = self.id_generator.getMixture(medium_name, medium_number)
+                medium_creating_id = self.id_generator.getMixtureCreating(medium_name,\
+                    medium_number)
 
                 if not found_existing:
                     # check if the plan is existing
-                    plan_number = 1
-                    found_existing_plan = False
-                    while True:
-                        medium_plan_id = self.id_generator.getMixturePlan(medium_name, plan_number)
-                        if (medium_plan_id, RDF.type, URIRef('http://purl.obolibrary.org/obo/OBI_0000686')) not in self.graph:
-                            break
-
-                        if (medium_plan_id, RDFS.label, Literal(medium_foaf_name, lang='en')) in self.graph:
-                            found_existing_plan = True
-                            break
-
-                        plan_number += 1
+                    plan_number, found_existing_plan = \
+                        self.mixture_registry.get_plan(medium_name, medium_foaf_name)
+                    medium_plan_id = self.id_generator.getMixturePlan(medium_name, plan_number)
 
                     if not found_existing_plan:
                         self.graph.add((
                             medium_plan_id,
                             RDF.type,
-                            URIRef('http://purl.obolibrary.org/obo/OBI_0000686') # material combination objective
+                            OBO.material_combination_objective
                         ))
                         self.graph.add((
                             medium_plan_id,
@@ -747,23 +765,23 @@ class ELN2Crate:
                     self.graph.add((
                         medium_creating_id,
                         RDF.type,
-                        URIRef('http://purl.obolibrary.org/obo/OBI_0000685')
+                        OBO.creating_a_mixture
                     ))
                     self.graph.add((
                         medium_creating_id,
-                        URIRef('http://purl.obolibrary.org/obo/OBI_0000417'), # achieves_planned_objective
+                        OBO.achieves_planned_objective,
                         medium_plan_id
                     ))
                     self.graph.add((
                         medium_creating_id,
-                        URIRef('http://purl.obolibrary.org/obo/OBI_0000299'), # has_specified_output
+                        OBO.has_specified_output,
                         medium_id
                     ))
 
                     for item in current_items:
                         self.graph.add((
                             medium_creating_id,
-                            URIRef('http://purl.obolibrary.org/obo/OBI_0000293'), # has_specified_input #TODO: Alternative: prov:used?
+                            OBO.has_specified_input, #TODO: Alternative: prov:used?
                             item
                         ))
 
@@ -771,7 +789,7 @@ class ELN2Crate:
                     self.graph.add((
                         medium_id,
                         RDF.type,
-                        URIRef('http://purl.obolibrary.org/obo/OBI_0302729')
+                        OBO.mixture
                     ))
                     self.graph.add((
                         medium_id,
@@ -783,7 +801,7 @@ class ELN2Crate:
                 current_items = [medium_id]
 
                 if attributed_search:
-                    self.graph.add((medium_id, URIRef('prov:wasAttributedTo'), researcher_id))
+                    self.graph.add((medium_id, Prov.wasAttributedTo, researcher_id))
 
         return current_items
 
@@ -821,7 +839,7 @@ class ELN2Crate:
                         self.graph.add((
                             self.objective_id,
                             RDF.type,
-                            URIRef('http://purl.obolibrary.org/obo/IAO_0000005') # objective specification
+                            OBO.objective_specification
                         ))
                         self.graph.add((
                             self.objective_id,
@@ -830,7 +848,7 @@ class ELN2Crate:
                         ))
                         self.graph.add((
                             self.id_generator.getProtocol(),
-                            URIRef('http://purl.obolibrary.org/obo/OBI_0000417'),
+                            OBO.achieves_planned_objective,
                             self.objective_id
                         ))
 
@@ -887,37 +905,37 @@ class ELN2Crate:
 
                 # now, add the protocol sections as parts to the main protocol node
                 protocol_id = self.id_generator.getProtocol()
-                self.graph.add((protocol_id, RDF.type, URIRef('Action')))
-                self.graph.add((protocol_id, RDF.type, URIRef('bfo:process')))
-                self.graph.add((protocol_id, RDF.type, URIRef('prov:Activity')))
+                self.graph.add((protocol_id, RDF.type, Schema.Action))
+                self.graph.add((protocol_id, RDF.type, Bfo.process))
+                self.graph.add((protocol_id, RDF.type, Prov.Activity))
                 self.graph.add((
                     protocol_id,
-                    URIRef('foaf:name'),
+                    Foaf.name,
                     Literal(self.exp['title'], lang='en')
                 ))
                 self.graph.add((
                     protocol_id,
-                    URIRef('experiment_success'),
+                    Custom.experiment_success,
                     Literal(True if self.exp['category'] == 'Success' else False, \
                         datatype=XSD.boolean)
                 ))
                 # TODO: add RDF.type
                 self.graph.add((
                     protocol_id,
-                    URIRef('hasFile'),
+                    Schema.hasFile,
                     self.id_generator.getFile(\
                         os.path.join('Protocol/', sanitize_filename(self.exp['title']) + '.html'))
                 ))
                 for idx, section in enumerate(protocol_sections):
                     self.graph.add((
                         protocol_id,
-                        URIRef('hasPart'),
+                        Schema.hasPart,
                         self.id_generator.getProtocolSection(section)
                     ))
                     if idx > 0:
                         self.graph.add((
                             self.id_generator.getProtocolSection(protocol_sections[idx]),
-                            URIRef('prov:wasInformedBy'),
+                            Prov.wasInformedBy,
                             self.id_generator.getProtocolSection(protocol_sections[idx-1])
                         ))
 
@@ -929,32 +947,32 @@ class ELN2Crate:
                         self.graph.add((
                             template_id,
                             RDF.type,
-                            URIRef('prov:Plan')
+                            Prov.Plan
                         ))
                         self.graph.add((
                             template_id,
                             FOAF.name,
                             Literal(tag)
                         ))
-                        bassociation_id = BNode()
+                        bassociation_id = self.id_generator.getBlankNode()
                         self.graph.add((
                             protocol_id,
-                            URIRef('prov:qualifiedAssociation'),
+                            Prov.qualifiedAssociation,
                             bassociation_id
                         ))
                         self.graph.add((
                             bassociation_id,
                             RDF.type,
-                            URIRef('prov:Association')
+                            Prov.Association
                         ))
                         self.graph.add((
                             bassociation_id,
-                            URIRef('prov:hadPlan'),
+                            Prov.hadPlan,
                             template_id
                         ))
                         self.graph.add((
                             bassociation_id,
-                            URIRef('prov:agent'),
+                            Prov.agent,
                             self.researcher_id
                         ))
                         break
@@ -964,7 +982,7 @@ class ELN2Crate:
 
         self.graph.add((
             stage_id,
-            URIRef('description'),
+            Schema.description,
             Literal(title, lang='en')
         ))
         # TODO: add RDF.type for combination
@@ -973,32 +991,32 @@ class ELN2Crate:
         self.graph.add((
             template_id,
             RDF.type,
-            URIRef('prov:Plan')
+            Prov.Plan
         ))
         self.graph.add((
             template_id,
             FOAF.name,
             Literal(template_name)
         ))
-        bassociation_id = BNode()
+        bassociation_id = self.id_generator.getBlankNode()
         self.graph.add((
             stage_id,
-            URIRef('prov:qualifiedAssociation'),
+            Prov.qualifiedAssociation,
             bassociation_id
         ))
         self.graph.add((
             bassociation_id,
             RDF.type,
-            URIRef('prov:Association')
+            Prov.Association
         ))
         self.graph.add((
             bassociation_id,
-            URIRef('prov:hadPlan'),
+            Prov.hadPlan,
             template_id
         ))
         self.graph.add((
             bassociation_id,
-            URIRef('prov:agent'),
+            Prov.agent,
             self.researcher_id
         ))
 
@@ -1011,7 +1029,7 @@ class ELN2Crate:
 
     def _add_used_items(self, node_id, used_items):
         for item in used_items:
-            self.graph.add((node_id, URIRef('prov:used'), item))
+            self.graph.add((node_id, Prov.used, item))
 
 
     def _model_general_steps(self, soup_table, id_prefix):
@@ -1019,6 +1037,7 @@ class ELN2Crate:
             if idx == 0:
                 continue
 
+            self.instrumentation.count('steps')
             step_id = self.id_generator.getProtocolStep(id_prefix, idx)
             section_id = self.id_generator.getProtocolSection(id_prefix)
             description_text = row.contents[1].text.strip()
@@ -1027,14 +1046,13 @@ class ELN2Crate:
                 a.decompose()
             description_wo_links = description_wo_links.text.strip()
             description_low = row.contents[1].text.strip().lower()
-            self.graph.add((step_id, RDF.type, URIRef('Action')))
-            self.graph.add((step_id, RDF.type, URIRef('bfo:process')))
-            self.graph.add((step_id, RDF.type, URIRef('prov:Activity')))
+            self.graph.add((step_id, RDF.type, Schema.Action))
+            self.graph.add((step_id, RDF.type, Bfo.process))
+            self.graph.add((step_id, RDF.type, Prov.Activity))
             act_found = 0
-            for indicator, ontology_class in activities.items():
-                if indicator in description_low:
-                    self.graph.add((step_id, OWL.sameAs, URIRef(ontology_class)))
-                    act_found += 1
+            for indicator in activity_matcher.find_all(description_low):
+                self.graph.add((step_id, OWL.sameAs, activity_ids[indicator]))
+                act_found += 1
             if act_found == 0:
                 self.log.error(
                     'Did not found specific activity for description: "%s"' % (description_text)
@@ -1046,27 +1064,27 @@ class ELN2Crate:
                 start_time = datetime.strptime(row.contents[3].text, '%H:%M')
                 self.graph.add((
                     step_id,
-                    URIRef('startTime'),
+                    Schema.startTime,
                     Literal(start_time.strftime('%H:%M:%S'), datatype=XSD.time)
                 ))
             except ValueError:
                 self.graph.add((
                     step_id,
-                    URIRef('startTime'),
+                    Schema.startTime,
                     Literal(row.contents[3].text, datatype=XSD.string)
                 ))
 
             if idx > 1:
                 self.graph.add((
                     step_id,
-                    URIRef('prov:wasInformedBy'),
+                    Prov.wasInformedBy,
                     self.id_generator.getProtocolStep(id_prefix, idx-1)
                 ))
 
-            self.graph.add((section_id, URIRef('hasPart'), step_id))
+            self.graph.add((section_id, Schema.hasPart, step_id))
             self.graph.add((
                 step_id,
-                URIRef('description'),
+                Schema.description,
                 Literal(description_text.replace('\n', '\\n'), lang='en')
             ))
 
@@ -1084,7 +1102,7 @@ class ELN2Crate:
             for item_id in used_items:
                 self.graph.add((
                     step_id,
-                    URIRef('prov:used'),
+                    Prov.used,
                     item_id
                 ))
 
@@ -1092,20 +1110,86 @@ class ELN2Crate:
             for link in row.contents[1].find_all('a'):
                 if link['href'].startswith('app/download.php'):
                     parsed_link = parse.urlparse(link['href'])
+                    # NOTE: the name inside the link might be URL encoded, it has already
+                    # been pseudonymized by `_pseudonymize_download_links`
                     parsed_name = parse.parse_qs(parsed_link.query)['name'][0]
                     self.graph.add((
                         self.id_generator.getFile('Data/' + parsed_name),
-                        URIRef('prov:wasGeneratedBy'),
+                        Prov.wasGeneratedBy,
                         step_id
                     )) # TODO: we assume that name will be represented only once
 
+    def _write_metadata(self, stream):
+        with self.instrumentation.phase('serialize'):
+            self.json_ld_writer.write(self.graph, stream)
+
     def write_crate(self, target_archive):
-        self.graph.serialize(
-            format="json-ld",
-            context=self.graph_context,
-            destination=os.path.join(self.tempfolder, 'ro-crate-metadata.json')
+        # the meta data is serialized directly into the archive
+        # NOTE: the time of the zip phase includes the serialization
+        with self.instrumentation.phase('zip'):
+            self.crate_writer.write(self.tempfolder, target_archive + '.zip', {
+                'ro-crate-metadata.json': self._write_metadata
+            })
+        self.instrumentation.count('bytes_zipped', os.path.getsize(target_archive + '.zip'))
+        with open(ELN2Crate.get_state_filename(target_archive), 'w') as state_file:
+            json.dump(self._get_state(), state_file)
+
+    def write_ntriples(self, target_file, quads=False):
+        # line-oriented export of the model for triple stores, N-Quads use the
+        # protocol namespace as graph name
+        writer = NTriplesWriter(
+            self.graph_context,
+            self.protocol_namespace,
+            self.protocol_namespace if quads else None
         )
-        shutil.make_archive(target_archive, 'zip', self.tempfolder)
+        with open(target_file, 'wb') as stream:
+            writer.write(self.graph, stream)
+
+        return target_file
+
+    @staticmethod
+    def get_state_filename(target_archive):
+        return target_archive + '.state.json'
+
+    def _get_state(self):
+        # everything that is fetched from elabFTW and might change the crate
+        return {
+            'exp_id': str(self.exp['id']),
+            'lastchange': self.exp['lastchange'],
+            'items': {str(item['id']): item['lastchange'] for item in self.items},
+            'uploads': {
+                str(upload['id']): upload['datetime'] for upload in self.exp.get('uploads')
+            },
+            # NOTE: only store a hash in order to not reveal the names
+            'pseudonymize_persons': hashlib.sha512(
+                '\n'.join(self.pseudonymizer.names).encode('utf-8')
+            ).hexdigest()
+        }
+
+    def is_up_to_date(self, target_archive):
+        state_filename = ELN2Crate.get_state_filename(target_archive)
+        if not os.path.exists(target_archive + '.zip') or not os.path.exists(state_filename):
+            return False
+
+        with open(state_filename) as state_file:
+            try:
+                return json.load(state_file) == self._get_state()
+            except ValueError:
+                return False
+
+    def convert(self, target_archive, force=False):
+        # re-use the existing crate if nothing has changed in elabFTW
+        if not force and self.is_up_to_date(target_archive):
+            self.log.info('Crate "%s.zip" is up to date' % (target_archive))
+            return False
+
+        self.write_files()
+        self.create_model()
+        self.write_crate(target_archive)
+
+        return True
 
     def __del__(self):
         shutil.rmtree(self.tempfolder)
+        if hasattr(self, 'graph'):
+            self.graph.close()
@@ -0,0 +1,42 @@
+import json
+import os
+
+from datetime import datetime
+
+class FileManifest:
+    def __init__(self):
+        # file information indexed by the path relative to the crate folder
+        self.files = {}
+        # elabFTW uploads indexed by their file name
+        self.uploads = {}
+        self.scandate = None
+
+    def add_file(self, path, info):
+        self.files[path] = info
+
+    def add_uploads(self, uploads):
+        for upload in uploads:
+            # NOTE: keep the first upload in case of duplicate names
+            self.uploads.setdefault(upload['real_name'], upload)
+
+    def load_characterization(self, characterization_output, folder):
+        # parse the characterization output only once for all files
+        with open(characterization_output) as data_file:
+            data = json.load(data_file)
+
+        # 2021-04-12T09:21:53Z
+        self.scandate = datetime.strptime(data['scandate'], '%Y-%m-%dT%H:%M:%SZ')
+
+        folder_prefix = os.path.join(folder, '')
+        for metadata in data['files']:
+            filename = metadata['filename'].replace('/tmp/siegfried-files/', '')
+            if filename.startswith(folder_prefix):
+                filename = filename[len(folder_prefix):]
+            # information computed while writing the file takes precedence
+            self.files.setdefault(filename, metadata)
+
+    def get_file(self, path):
+        return self.files.get(path)
+
+    def get_upload(self, real_name):
+        return self.uploads.get(real_name)
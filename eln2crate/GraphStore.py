@@ -0,0 +1,163 @@
+import itertools
+import os
+import sqlite3
+import tempfile
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.store import Store
+
+def _encode_term(term):
+    # NOTE: use empty strings instead of NULL, as NULL values are never equal in
+    # UNIQUE constraints
+    if isinstance(term, Literal):
+        return 'L', str(term), str(term.datatype or ''), term.language or ''
+    if isinstance(term, BNode):
+        return 'B', str(term), '', ''
+
+    return 'U', str(term), '', ''
+
+def _decode_term(kind, value, datatype='', language=''):
+    if kind == 'L':
+        return Literal(value, lang=language or None, datatype=datatype or None)
+    if kind == 'B':
+        return BNode(value)
+
+    return URIRef(value)
+
+class SQLiteStore(Store):
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+
+    def __init__(self, path=None, batch_size=10000):
+        super().__init__()
+        # without a path the store is a temporary file that is removed on close
+        self.remove_on_close = path is None
+        if path is None:
+            store_file, path = tempfile.mkstemp(suffix='.sqlite')
+            os.close(store_file)
+        self.path = path
+        # added triples are written in batches of this size
+        self.batch_size = batch_size
+        self.pending = []
+        self.prefixes = {}
+        self.namespace_prefixes = {}
+
+        self.connection = sqlite3.connect(self.path)
+        # NOTE: the store only holds intermediate results, so durability is not needed
+        self.connection.execute('PRAGMA journal_mode=OFF')
+        self.connection.execute('PRAGMA synchronous=OFF')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS triples (s_kind TEXT, s_value TEXT, p TEXT, '
+            'o_kind TEXT, o_value TEXT, o_datatype TEXT, o_language TEXT, '
+            'UNIQUE (s_kind, s_value, p, o_kind, o_value, o_datatype, o_language))'
+        )
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS triples_object ON triples (o_value, p)'
+        )
+
+    def _flush(self):
+        if not self.pending:
+            return
+
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO triples VALUES (?, ?, ?, ?, ?, ?, ?)',
+                self.pending
+            )
+        self.pending = []
+
+    @staticmethod
+    def _get_condition(triple):
+        s, p, o = triple
+        columns = []
+        values = []
+        if s is not None:
+            columns += ['s_kind', 's_value']
+            values += _encode_term(s)[:2]
+        if p is not None:
+            columns.append('p')
+            values.append(str(p))
+        if o is not None:
+            columns += ['o_kind', 'o_value', 'o_datatype', 'o_language']
+            values += _encode_term(o)
+
+        if not columns:
+            return '', values
+
+        return ' WHERE ' + ' AND '.join('%s = ?' % (column) for column in columns), values
+
+    def add(self, triple, context, quoted=False):
+        s, p, o = triple
+        self.pending.append(_encode_term(s)[:2] + (str(p),) + _encode_term(o))
+        if len(self.pending) >= self.batch_size:
+            self._flush()
+
+    def remove(self, triple, context=None):
+        self._flush()
+        condition, values = SQLiteStore._get_condition(triple)
+        with self.connection:
+            self.connection.execute('DELETE FROM triples' + condition, values)
+
+    def triples(self, triple_pattern, context=None):
+        self._flush()
+        condition, values = SQLiteStore._get_condition(triple_pattern)
+        rows = self.connection.execute('SELECT * FROM triples' + condition, values)
+        if triple_pattern[0] is not None:
+            # NOTE: triples of a single subject are often copied while iterating, so
+            # read them completely before new triples might be written
+            rows = rows.fetchall()
+
+        for s_kind, s_value, p, o_kind, o_value, o_datatype, o_language in rows:
+            yield (
+                _decode_term(s_kind, s_value),
+                URIRef(p),
+                _decode_term(o_kind, o_value, o_datatype, o_language)
+            ), iter(())
+
+    def iter_subjects(self):
+        # all triples grouped by their subject, without loading the whole graph
+        self._flush()
+        rows = self.connection.execute('SELECT * FROM triples ORDER BY s_kind, s_value')
+        for (s_kind, s_value), subject_rows in itertools.groupby(rows, lambda row: row[:2]):
+            yield _decode_term(s_kind, s_value), [
+                (URIRef(p), _decode_term(o_kind, o_value, o_datatype, o_language))
+                for _, _, p, o_kind, o_value, o_datatype, o_language in subject_rows
+            ]
+
+    def __len__(self, context=None):
+        self._flush()
+        return self.connection.execute('SELECT COUNT(*) FROM triples').fetchone()[0]
+
+    def bind(self, prefix, namespace):
+        self.prefixes[prefix] = namespace
+        self.namespace_prefixes[namespace] = prefix
+
+    def namespace(self, prefix):
+        return self.prefixes.get(prefix)
+
+    def prefix(self, namespace):
+        return self.namespace_prefixes.get(namespace)
+
+    def namespaces(self):
+        for prefix, namespace in self.prefixes.items():
+            yield prefix, namespace
+
+    def close(self, commit_pending_transaction=False):
+        if self.connection is None:
+            return
+
+        self.connection.close()
+        self.connection = None
+        if self.remove_on_close:
+            os.remove(self.path)
+
+def iter_subjects(graph):
+    # the triples of a graph grouped by their subject
+    if hasattr(graph.store, 'iter_subjects'):
+        # NOTE: a disk-backed store groups the triples without loading the whole graph
+        yield from graph.store.iter_subjects()
+        return
+
+    for subject in set(graph.subjects()):
+        yield subject, list(graph.predicate_objects(subject))
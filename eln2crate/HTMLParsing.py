@@ -0,0 +1,71 @@
+import re
+
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+
+# NOTE: lxml is faster but repairs malformed HTML differently (e.g., a <table> inside a <p>
+# closes the paragraph), which changes the structure that is modeled, so it is only used
+# if it is selected explicitly
+default_parser = 'html.parser'
+
+# only the tables of database items are evaluated
+item_strainer = SoupStrainer('table')
+
+def parse_html(html, parser=None, parse_only=None):
+    return BeautifulSoup(html, parser or default_parser, parse_only=parse_only)
+
+# tags inside of these are not recognized by a regular expression
+unscanned_pattern = re.compile(r'<(!|script\b|style\b)', re.IGNORECASE)
+
+def extract_first_table(html):
+    # cut out the first (possibly nested) table so that the rest of the document
+    # does not need to be parsed at all
+    # NOTE: if the cut might not be clean (e.g., a table inside a comment or a truncated
+    # closing tag), the complete document is returned and filtered by the parser instead
+    if unscanned_pattern.search(html):
+        return html
+
+    start = None
+    depth = 0
+    for tag in re.finditer(r'<(/?)table\b', html, re.IGNORECASE):
+        if not tag.group(1):
+            if start is None:
+                start = tag.start()
+            depth += 1
+        elif start is not None:
+            depth -= 1
+            if depth == 0:
+                end = html.find('>', tag.end())
+                if end < 0:
+                    return html
+                return html[start:end + 1]
+
+    return html if start is None else html[start:]
+
+def parse_item_table(html, parser=None):
+    return parse_html(extract_first_table(html), parser, item_strainer)
+
+def _serialize_node(node):
+    # strings (including comments) are written like inside the document
+    if isinstance(node, NavigableString):
+        return node.output_ready()
+
+    return node.decode()
+
+def serialize_html(soup, html):
+    # NOTE: lxml wraps fragments into <html><body>, which is not part of the original document,
+    # nodes before or after this wrapper (e.g., a leading comment) are kept at their position
+    if soup.html is None or re.search(r'<html', html, re.IGNORECASE):
+        return str(soup)
+
+    parts = []
+    for node in soup.contents:
+        if node is not soup.html:
+            parts.append(_serialize_node(node))
+            continue
+        for child in node.contents:
+            if getattr(child, 'name', None) in ['head', 'body']:
+                parts.append(child.decode_contents())
+            else:
+                parts.append(_serialize_node(child))
+
+    return ''.join(parts)
@@ -1,10 +1,31 @@
-from rdflib import URIRef
+import functools
+
+from rdflib import BNode, URIRef
+
+def memoize(get_key=lambda *args: args):
+    # the same IRIs are requested many times, so they are created only once per generator
+    # NOTE: get_key reduces the arguments to something hashable that identifies the IRI
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            key = (method.__name__, get_key(*args))
+            try:
+                return self.cache[key]
+            except KeyError:
+                iri = self.cache[key] = method(self, *args)
+                return iri
+        return wrapper
+    return decorator
 
 class IDGenerator:
-    def __init__(self, general_namespace, protocol_namespace):
+    def __init__(self, general_namespace, protocol_namespace, blank_node_prefix=''):
         self.general_namespace = general_namespace
         self.protocol_namespace = protocol_namespace
+        self.cache = {}
+        self.blank_node_prefix = blank_node_prefix
+        self.blank_nodes = 0
 
+    @memoize(lambda researcher_key, researcher: researcher_key)
     def getResearcher(self, researcher_key, researcher):
         if researcher.get('orcid'):
             return URIRef(researcher['orcid'])
@@ -18,6 +39,7 @@ class IDGenerator:
 
         return URIRef(self.general_namespace[researcher_id])
 
+    @memoize(lambda institution_key, institution: institution_key)
     def getInstitution(self, institution_key, institution):
         if institution.get('ror'):
             return URIRef(institution.get('ror'))
@@ -26,6 +48,7 @@ class IDGenerator:
 
         return URIRef(self.general_namespace[institution_id])
 
+    @memoize(lambda manufacturer_key, manufacturer: manufacturer_key)
     def getManufacturer(self, manufacturer_key, manufacturer):
         if manufacturer.get('id'):
             return URIRef(manufacturer.get('id'))
@@ -35,60 +58,81 @@ class IDGenerator:
 
         return URIRef(self.general_namespace[manufacturer_id])
 
+    def getBlankNode(self):
+        # NOTE: numbered in the order of creation, so that the labels are the same
+        # whenever an experiment is converted
+        self.blank_nodes += 1
+        return BNode('%sb%i' % (self.blank_node_prefix, self.blank_nodes))
+
     def getDataset(self):
         return URIRef('./')
 
+    @memoize(lambda item: item['id'])
     def getDBItem(self, item):
         item_id = 'database/%s' % (item['id'])
 
         return URIRef(self.general_namespace[item_id])
 
+    @memoize(lambda item, lot_number: (item['id'], lot_number))
     def getDBLotInstance(self, item, lot_number):
         item_id = 'database/%s/lot/%s' % (item['id'], lot_number)
 
         return URIRef(self.general_namespace[item_id])
 
+    @memoize(lambda item, lot_number, passage_number: \
+        (item['id'], lot_number, passage_number))
     def getDBLotPassageInstance(self, item, lot_number, passage_number):
         item_id = 'database/%s/lot/%s/passage/%s' % (item['id'], lot_number, passage_number)
 
         return URIRef(self.general_namespace[item_id])
 
+    @memoize()
     def getTemplate(self, template_key):
         temp_id = 'template/%s' % (template_key)
 
         return URIRef(self.general_namespace[temp_id])
 
+    @memoize()
     def getSectionTemplate(self, template_key):
         temp_id = 'template/%s' % (template_key)
 
         return URIRef(self.general_namespace[temp_id])
 
+    @memoize()
     def getLicense(self, license_name):
         license_id = 'license/%s' % (license_name)
 
         return URIRef(self.general_namespace[license_id])
 
+    @memoize()
     def getFile(self, filepath):
         return URIRef(filepath.replace(' ', '%20'))
 
+    @memoize()
     def getObjective(self):
         # NOTE: we assume there is only one objective
         return URIRef(self.protocol_namespace.objective)
 
+    @memoize()
     def getProtocol(self):
         return URIRef(self.protocol_namespace['protocol'])
 
+    @memoize()
     def getProtocolSection(self, section):
         return URIRef(self.protocol_namespace[section])
 
+    @memoize()
     def getProtocolStep(self, section, step_number):
         return URIRef(self.protocol_namespace['%s/%s' % (section, step_number)])
 
+    @memoize()
     def getMixture(self, ingredients, number):
         return URIRef(self.protocol_namespace['mixture/%s/%i' % (ingredients, number)])
 
+    @memoize()
     def getMixtureCreating(self, ingredients, number):
         return URIRef(self.protocol_namespace['mixture/%s/%i/creating' % (ingredients, number)])
 
+    @memoize()
     def getMixturePlan(self, ingredients, number):
         return URIRef(self.protocol_namespace['mixture/%s/plan/%i' % (ingredients, number)])
\ No newline at end of file
@@ -0,0 +1,91 @@
+import json
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+
+def _get_max_rss():
+    # NOTE: Linux reports KiB, macOS bytes
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+class Instrumentation:
+    def __init__(self, callback=None, trace_memory=False):
+        # measurements and counters of a single conversion
+        self.phases = {}
+        self.counters = {}
+        # called with the name and the measurement whenever a phase has finished
+        self.callback = callback
+        # tracemalloc reports the peak of the python allocations of each phase (`peak_memory`),
+        # but slows down the conversion, so by default only the peak resident memory of the
+        # process is recorded (`process_peak_memory`)
+        self.trace_memory = trace_memory
+        self.stack = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            # NOTE: keep the peak of the enclosing phase before it is reset
+            if self.stack:
+                self.stack[-1]['peak'] = max(self.stack[-1]['peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        current = {'peak': 0}
+        self.stack.append(current)
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - wall_time
+            # NOTE: includes the CPU time of all threads, e.g., of parallel downloads
+            cpu_time = time.process_time() - cpu_time
+            self.stack.pop()
+
+            measurement = self.phases.setdefault(name, {
+                'calls': 0,
+                'wall_time': 0.0,
+                'cpu_time': 0.0,
+                'process_peak_memory': 0
+            })
+            measurement['calls'] += 1
+            measurement['wall_time'] += wall_time
+            measurement['cpu_time'] += cpu_time
+            # NOTE: this is the peak since the start of the process, so it is cumulative and
+            # all phases after the largest one report the same value
+            measurement['process_peak_memory'] = max(
+                measurement['process_peak_memory'],
+                _get_max_rss()
+            )
+            if self.trace_memory:
+                peak_memory = max(current['peak'], tracemalloc.get_traced_memory()[1])
+                if self.stack:
+                    self.stack[-1]['peak'] = max(self.stack[-1]['peak'], peak_memory)
+                measurement['peak_memory'] = max(measurement.get('peak_memory', 0), peak_memory)
+
+            if self.callback:
+                self.callback(name, dict(measurement))
+
+    def count(self, name, value=1):
+        # NOTE: counters are also increased by the download threads
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def count_chunks(self, name, chunks):
+        for chunk in chunks:
+            self.count(name, len(chunk))
+            yield chunk
+
+    def as_dict(self):
+        return {
+            'phases': {name: dict(measurement) for name, measurement in self.phases.items()},
+            'counters': dict(self.counters)
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
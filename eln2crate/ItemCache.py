@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import time
+
+from contextlib import closing
+
+class ItemCache:
+    def __init__(self, path, max_age=30*24*3600, max_entries=10000, index_max_age=600,
+                 evict_interval=600):
+        # NOTE: the cache is a SQLite database so that it can be shared by several
+        # runs and by the worker processes of a batch conversion
+        self.path = path
+        # entries that have not been used for max_age seconds are evicted
+        self.max_age = max_age
+        # if there are more entries, the least recently used ones are evicted
+        self.max_entries = max_entries
+        # the list of the current lastchange values of all items is re-used for this time
+        self.index_max_age = index_max_age
+        # long-lived instances evict entries again after this time when items are added
+        self.evict_interval = evict_interval
+        self._lastchanges = None
+        self._lastchanges_updated = 0
+        self._evicted = 0
+        self._lastchanges_lock = threading.Lock()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS items (
+                id TEXT PRIMARY KEY,
+                lastchange TEXT,
+                data TEXT,
+                accessed REAL
+            )''')
+            conn.execute('''CREATE TABLE IF NOT EXISTS lastchanges (
+                id TEXT PRIMARY KEY,
+                lastchange TEXT
+            )''')
+            conn.execute('''CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value REAL
+            )''')
+        self.evict()
+
+    def __getstate__(self):
+        # locks cannot be sent to other processes
+        state = self.__dict__.copy()
+        del state['_lastchanges_lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lastchanges_lock = threading.Lock()
+
+    def _connect(self):
+        # a new connection is used for each operation as items are fetched by several threads
+        conn = sqlite3.connect(self.path, timeout=60)
+        conn.execute('PRAGMA journal_mode=WAL')
+
+        return conn
+
+    def _get_lastchanges(self, elabftw_manager):
+        with self._lastchanges_lock:
+            # NOTE: the list is also reloaded by long-lived instances, e.g., of a service
+            if self._lastchanges is not None \
+                    and self._lastchanges_updated > time.time() - self.index_max_age:
+                return self._lastchanges
+
+            with closing(self._connect()) as conn, conn:
+                updated = conn.execute(
+                    'SELECT value FROM meta WHERE key = ?',
+                    ('lastchanges_updated',)
+                ).fetchone()
+                if updated and updated[0] > time.time() - self.index_max_age:
+                    self._lastchanges = dict(conn.execute('SELECT id, lastchange FROM lastchanges'))
+                    self._lastchanges_updated = updated[0]
+                    return self._lastchanges
+
+                # a single request provides the lastchange value of all items
+                self._lastchanges = {
+                    str(item['id']): item.get('lastchange')
+                    for item in elabftw_manager.get_all_items()
+                }
+                self._lastchanges_updated = time.time()
+                conn.execute('DELETE FROM lastchanges')
+                conn.executemany(
+                    'INSERT INTO lastchanges (id, lastchange) VALUES (?, ?)',
+                    self._lastchanges.items()
+                )
+                conn.execute(
+                    'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                    ('lastchanges_updated', self._lastchanges_updated)
+                )
+
+            return self._lastchanges
+
+    def get_item(self, elabftw_manager, item_id):
+        item_id = str(item_id)
+        lastchange = self._get_lastchanges(elabftw_manager).get(item_id)
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                'SELECT lastchange, data FROM items WHERE id = ?',
+                (item_id,)
+            ).fetchone()
+            if row and lastchange is not None and row[0] == lastchange:
+                conn.execute('UPDATE items SET accessed = ? WHERE id = ?', (time.time(), item_id))
+                return json.loads(row[1])
+
+        item = elabftw_manager.get_item(item_id)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO items (id, lastchange, data, accessed) VALUES (?, ?, ?, ?)',
+                (item_id, item.get('lastchange'), json.dumps(item), time.time())
+            )
+        if self._evicted < time.time() - self.evict_interval:
+            self.evict()
+
+        return item
+
+    def evict(self):
+        self._evicted = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM items WHERE accessed < ?', (time.time() - self.max_age,))
+            conn.execute('''DELETE FROM items WHERE id NOT IN (
+                SELECT id FROM items ORDER BY accessed DESC LIMIT ?
+            )''', (self.max_entries,))
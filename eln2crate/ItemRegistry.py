@@ -0,0 +1,35 @@
+from pathvalidate import sanitize_filename
+
+class ItemRegistry:
+    def __init__(self, items):
+        # NOTE: several items might share an id or a file name, so we keep the
+        # position in the list in order to always resolve to the first one
+        self.positions = {}
+        self.by_id = {}
+        self.by_link = {}
+        self.filenames = {}
+
+        for position, item in enumerate(items):
+            self.positions[id(item)] = position
+            self.by_id.setdefault(item['id'], []).append(item)
+            filename = sanitize_filename('%s - %s' % (item['category'], item['title'])) + '.html'
+            self.filenames[id(item)] = filename
+
+    def get_items_by_id(self, item_id):
+        return self.by_id.get(item_id, [])
+
+    def get_by_link(self, link):
+        return self.by_link.get(link)
+
+    def get_filename(self, item):
+        return self.filenames[id(item)]
+
+    @staticmethod
+    def get_link(item):
+        return item['ro-crate_link']
+
+    def set_link(self, item, link):
+        item['ro-crate_link'] = link
+        existing = self.by_link.get(link)
+        if not existing or self.positions[id(existing)] > self.positions[id(item)]:
+            self.by_link[link] = item
@@ -0,0 +1,95 @@
+import json
+
+from rdflib import BNode, Literal
+from rdflib.namespace import RDF, XSD
+from rdflib_jsonld.util import split_iri
+
+from .GraphStore import iter_subjects
+
+# literals of these types are written as JSON values (same as rdflib-jsonld)
+native_types = {XSD.boolean, XSD.integer, XSD.double, XSD.string}
+
+def get_prefixes(context):
+    # the prefixes defined locally in a JSON-LD context (without remote contexts)
+    prefixes = {}
+    for context_part in context if isinstance(context, list) else [context]:
+        if isinstance(context_part, dict):
+            for prefix, namespace in context_part.items():
+                if not prefix.startswith('@'):
+                    prefixes[prefix] = str(namespace)
+
+    return prefixes
+
+class JSONLDWriter:
+    def __init__(self, context):
+        # NOTE: only the local prefixes are used for compacting, so that the remote
+        # RO-Crate context does not need to be fetched
+        self.context = context
+        self.prefixes = {
+            namespace: prefix for prefix, namespace in get_prefixes(context).items()
+        }
+
+    def compact_iri(self, iri):
+        namespace, name = split_iri(str(iri))
+        prefix = self.prefixes.get(namespace)
+        if prefix and name is not None:
+            return '%s:%s' % (prefix, name)
+
+        return str(iri)
+
+    def get_id(self, node):
+        if isinstance(node, BNode):
+            return node.n3()
+
+        return self.compact_iri(node)
+
+    def get_value(self, o):
+        if isinstance(o, Literal):
+            if o.datatype in native_types:
+                return o.toPython()
+            if o.datatype:
+                return {'@type': self.compact_iri(o.datatype), '@value': str(o)}
+            if o.language:
+                return {'@language': o.language, '@value': str(o)}
+
+            return str(o)
+
+        return {'@id': self.get_id(o)}
+
+    def get_node(self, subject, predicate_objects):
+        node = {'@id': self.get_id(subject)}
+        for p, o in predicate_objects:
+            if p == RDF.type and not isinstance(o, Literal):
+                key = '@type'
+                value = self.compact_iri(o)
+            else:
+                key = self.compact_iri(p)
+                value = self.get_value(o)
+
+            # a single value is written directly, several values as list
+            if key not in node:
+                node[key] = value
+            elif isinstance(node[key], list):
+                node[key].append(value)
+            else:
+                node[key] = [node[key], value]
+
+        return node
+
+    def write(self, graph, stream, encoding='utf-8'):
+        # flattened layout as expected by RO-Crate: every subject is a node of @graph
+        stream.write(('{\n  "@context": %s,\n  "@graph": [' % (
+            json.dumps(self.context, indent=2, sort_keys=True, ensure_ascii=False)\
+                .replace('\n', '\n  ')
+        )).encode(encoding))
+        for idx, (subject, predicate_objects) in enumerate(iter_subjects(graph)):
+            stream.write(('%s\n    %s' % (
+                ',' if idx > 0 else '',
+                json.dumps(
+                    self.get_node(subject, predicate_objects),
+                    indent=2,
+                    sort_keys=True,
+                    ensure_ascii=False
+                ).replace('\n', '\n    ')
+            )).encode(encoding, 'replace'))
+        stream.write(b'\n  ]\n}')
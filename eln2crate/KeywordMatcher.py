@@ -0,0 +1,54 @@
+from collections import deque
+
+class KeywordMatcher:
+    # Aho-Corasick automaton that finds all keywords inside a text in a single pass
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self.transitions = [{}]
+        self.outputs = [set()]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions.append({})
+                    self.outputs.append(set())
+                    self.transitions[state][char] = next_state
+                state = next_state
+            self.outputs[state].add(index)
+
+        # failure links point to the longest suffix that is also a prefix of a keyword
+        self.failures = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                failure = self.failures[state]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[next_state] = self.transitions[failure].get(char, 0)
+                self.outputs[next_state] |= self.outputs[self.failures[next_state]]
+
+    def _find_indices(self, text):
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self.transitions[state]:
+                state = self.failures[state]
+            state = self.transitions[state].get(char, 0)
+            found |= self.outputs[state]
+
+        return found
+
+    def find_all(self, text):
+        # all keywords that occur in the text, in the order of the keywords
+        return [self.keywords[index] for index in sorted(self._find_indices(text))]
+
+    def find_first(self, text):
+        # the first of the keywords (not the first occurrence) that occurs in the text
+        found = self._find_indices(text)
+
+        return self.keywords[min(found)] if found else None
@@ -1,8 +1,32 @@
 mime_types = {
     '.csv': 'text/csv',
     '.czi': 'application/octet-stream',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
     '.html': 'text/html',
+    '.jpeg': 'image/jpeg',
+    '.jpg': 'image/jpeg',
     '.json': 'application/json',
+    '.lsm': 'image/tiff',
+    '.md': 'text/markdown',
+    '.pdf': 'application/pdf',
+    '.png': 'image/png',
+    '.tif': 'image/tiff',
+    '.tiff': 'image/tiff',
     '.txt': 'text/plain',
-    '.xml': 'text/xml'
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.xml': 'text/xml',
+    '.zip': 'application/zip'
+}
+
+# NOTE: data formats that are already compressed (or barely compress) are stored as they are,
+# all other files are deflated inside the crate
+uncompressed_types = {
+    '.czi',
+    '.docx',
+    '.jpeg',
+    '.jpg',
+    '.lsm',
+    '.png',
+    '.xlsx',
+    '.zip'
 }
@@ -0,0 +1,45 @@
+class MixtureRegistry:
+    def __init__(self):
+        # mixtures and plans indexed by the medium name, i.e., the concentrations and
+        # ids of all ingredients, so that the numbering does not need to probe the graph
+        self.mixtures = {}
+        self.plans = {}
+
+    def get_mixture(self, medium_name, researcher_id=None):
+        # returns the number of the mixture and whether it already exists
+        # NOTE: a mixture is re-used if it is attributed to the same researcher or if
+        # it is not attributed at all and there is no researcher given
+        mixture = self.mixtures.setdefault(medium_name, {
+            'count': 0,
+            'attributed': {},
+            'unattributed': None
+        })
+
+        if researcher_id is None:
+            number = mixture['unattributed']
+        else:
+            number = mixture['attributed'].get(researcher_id)
+        if number is not None:
+            return number, True
+
+        mixture['count'] += 1
+        number = mixture['count']
+        if researcher_id is None:
+            mixture['unattributed'] = number
+        else:
+            mixture['attributed'][researcher_id] = number
+
+        return number, False
+
+    def get_plan(self, medium_name, label):
+        # returns the number of the plan with the given label and whether it already exists
+        plan = self.plans.setdefault(medium_name, {'count': 0, 'labels': {}})
+
+        number = plan['labels'].get(label)
+        if number is not None:
+            return number, True
+
+        plan['count'] += 1
+        plan['labels'][label] = plan['count']
+
+        return plan['count'], False
@@ -0,0 +1,87 @@
+import re
+
+from urllib.parse import urljoin
+
+from rdflib import BNode, Literal
+from rdflib.namespace import RDF
+
+from .GraphStore import iter_subjects
+from .JSONLDWriter import get_prefixes
+
+# the vocabulary of the RO-Crate context
+VOCAB = 'http://schema.org/'
+# terms of the RO-Crate context that are named differently in schema.org
+vocab_terms = {
+    'File': 'http://schema.org/MediaObject'
+}
+
+scheme_pattern = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*:')
+
+def quote_literal(value):
+    # same escaping as the N-Triples serializer of rdflib
+    return '"%s"' % (
+        value.replace('\\', '\\\\')\
+            .replace('"', '\\"')\
+            .replace('\n', '\\n')\
+            .replace('\r', '\\r')
+    )
+
+class NTriplesWriter:
+    def __init__(self, context, base, graph_name=None):
+        # NOTE: the graph contains the same compact and relative IRIs as the JSON-LD, so
+        # they are expanded like a JSON-LD processor would do with the crate:
+        # * prefixes of the context are expanded
+        # * terms (predicates and types) are resolved against the vocabulary
+        # * other relative IRIs are resolved against the base
+        self.prefixes = get_prefixes(context)
+        self.base = str(base)
+        # N-Quads are written if a graph name is given
+        self.graph_name = graph_name
+        self.resolved = {}
+
+    def resolve(self, iri, vocab=False):
+        key = (iri, vocab)
+        if key in self.resolved:
+            return self.resolved[key]
+
+        prefix, colon, name = iri.partition(':')
+        if colon and prefix in self.prefixes:
+            resolved = self.prefixes[prefix] + name
+        elif scheme_pattern.match(iri):
+            resolved = iri
+        elif vocab:
+            resolved = vocab_terms.get(iri, VOCAB + iri)
+        else:
+            resolved = urljoin(self.base, iri)
+
+        self.resolved[key] = resolved
+        return resolved
+
+    def get_term(self, term, vocab=False):
+        if isinstance(term, BNode):
+            return '_:%s' % (term)
+        if isinstance(term, Literal):
+            if term.language:
+                return '%s@%s' % (quote_literal(str(term)), term.language)
+            if term.datatype:
+                return '%s^^<%s>' % (quote_literal(str(term)), term.datatype)
+
+            return quote_literal(str(term))
+
+        return '<%s>' % (self.resolve(str(term), vocab))
+
+    def get_line(self, triple, graph_name=None):
+        s, p, o = triple
+        return '%s %s %s%s .\n' % (
+            self.get_term(s),
+            self.get_term(p, vocab=True),
+            self.get_term(o, vocab=(p == RDF.type)),
+            ' <%s>' % (graph_name) if graph_name else ''
+        )
+
+    def write(self, graph, stream, encoding='utf-8'):
+        # one line per triple, written subject by subject
+        for subject, predicate_objects in iter_subjects(graph):
+            stream.write(''.join(
+                self.get_line((subject, p, o), self.graph_name) for p, o in predicate_objects
+            ).encode(encoding))
@@ -0,0 +1,34 @@
+import re
+
+from urllib import parse
+
+class Pseudonymizer:
+    def __init__(self, names):
+        # NOTE: the pseudonym only depends on the position of the name in the list, so the same
+        # list always results in the same pseudonyms (see also `persons` for the pseudonyms)
+        self.names = list(names)
+        self.pseudonyms = {}
+        for i, name in enumerate(self.names):
+            self.pseudonyms.setdefault(name, 'Anonymous Person%d' % (i+1))
+
+        # all names are replaced within a single pass over the text
+        self.pattern = re.compile('|'.join(re.escape(name) for name in self.pseudonyms)) \
+            if self.pseudonyms else None
+
+    def pseudonymize(self, text):
+        if not self.pattern:
+            return text
+
+        return self.pattern.sub(lambda name: self.pseudonyms[name.group()], text)
+
+    def pseudonymize_link(self, href, parameter='name'):
+        # NOTE: names inside query parameters are URL encoded, so they are not found in the text
+        def replace(match):
+            value = parse.unquote_plus(match.group(2))
+            pseudonymized = self.pseudonymize(value)
+            if pseudonymized == value:
+                return match.group()
+
+            return match.group(1) + parse.quote(pseudonymized)
+
+        return re.sub(r'([?&]%s=)([^&#]*)' % (re.escape(parameter)), replace, href)
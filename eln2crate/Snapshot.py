@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .Download import CHUNK_SIZE, iter_upload, write_chunks
+
+# layout of a snapshot folder, database items and uploads are shared by all experiments
+SNAPSHOT_FOLDERS = ['experiments', 'items', 'uploads', 'tmp']
+
+def _get_path(path, folder, name, extension=''):
+    return os.path.join(path, folder, '%s%s' % (name, extension))
+
+class SnapshotExporter:
+    def __init__(self, elabftw_manager, path, fetch_workers=4, download_chunk_size=CHUNK_SIZE):
+        # NOTE: the snapshot contains the unmodified responses of elabFTW, persons are
+        # pseudonymized when a crate is created from it
+        self.elabftw_manager = elabftw_manager
+        self.path = path
+        self.fetch_workers = fetch_workers
+        self.download_chunk_size = download_chunk_size
+        # database items that have already been exported during this run
+        self.exported_items = set()
+        for folder in SNAPSHOT_FOLDERS:
+            os.makedirs(os.path.join(self.path, folder), exist_ok=True)
+
+    def _new_tmp_path(self):
+        tmp_file, tmp_path = tempfile.mkstemp(dir=os.path.join(self.path, 'tmp'))
+        os.close(tmp_file)
+
+        return tmp_path
+
+    def _write_json(self, data, target_path):
+        # files only appear once they have been written completely
+        tmp_path = self._new_tmp_path()
+        with open(tmp_path, 'w') as tmp_file:
+            json.dump(data, tmp_file)
+        os.replace(tmp_path, target_path)
+
+    def _export_item(self, item_id):
+        if str(item_id) in self.exported_items:
+            return
+        self._write_json(
+            self.elabftw_manager.get_item(item_id),
+            _get_path(self.path, 'items', item_id, '.json')
+        )
+        self.exported_items.add(str(item_id))
+
+    def _export_upload(self, upload):
+        # NOTE: the content of an upload never changes, so it is only downloaded once
+        target_path = _get_path(self.path, 'uploads', upload['id'])
+        if os.path.exists(target_path):
+            return
+
+        tmp_path = self._new_tmp_path()
+        try:
+            write_chunks(
+                iter_upload(self.elabftw_manager, upload['id'], self.download_chunk_size),
+                tmp_path
+            )
+        except:
+            os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, target_path)
+
+    def export(self, exp_id):
+        exp = self.elabftw_manager.get_experiment(exp_id)
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            # consume the results in order to propagate exceptions of the workers
+            list(executor.map(self._export_item, [item['itemid'] for item in exp.get('links')]))
+            list(executor.map(self._export_upload, exp.get('uploads')))
+        # NOTE: the experiment is written last, so that it is only part of the snapshot
+        # if its items and uploads are complete
+        self._write_json(exp, _get_path(self.path, 'experiments', exp_id, '.json'))
+
+        return exp
+
+class SnapshotManager:
+    def __init__(self, path):
+        # serves a snapshot folder with the interface of `elabapy.Manager`, the manager
+        # only holds the path, so it can be sent to the worker processes of a batch
+        self.path = path
+
+    @staticmethod
+    def _read_json(path):
+        # NOTE: every call returns new objects as ELN2Crate modifies the experiment
+        with open(path) as json_file:
+            return json.load(json_file)
+
+    def get_experiment_ids(self):
+        return sorted(
+            int(filename[:-len('.json')])
+            for filename in os.listdir(os.path.join(self.path, 'experiments'))
+            if filename.endswith('.json')
+        )
+
+    def get_experiment(self, exp_id):
+        return SnapshotManager._read_json(_get_path(self.path, 'experiments', exp_id, '.json'))
+
+    def get_item(self, item_id):
+        return SnapshotManager._read_json(_get_path(self.path, 'items', item_id, '.json'))
+
+    def get_all_items(self):
+        items_path = os.path.join(self.path, 'items')
+        items = []
+        for filename in os.listdir(items_path):
+            if not filename.endswith('.json'):
+                continue
+            item = SnapshotManager._read_json(os.path.join(items_path, filename))
+            items.append({'id': item['id'], 'lastchange': item['lastchange']})
+
+        return items
+
+    def iter_upload(self, upload_id, chunk_size=CHUNK_SIZE):
+        with open(_get_path(self.path, 'uploads', upload_id), 'rb') as upload_file:
+            while True:
+                chunk = upload_file.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def get_upload(self, upload_id):
+        with open(_get_path(self.path, 'uploads', upload_id), 'rb') as upload_file:
+            return upload_file.read()
@@ -0,0 +1,45 @@
+import re
+
+from rdflib import URIRef
+from rdflib.namespace import XSD
+
+# NOTE: the keys are regular expressions matching the unit symbol after a number
+units = {
+    r'°\s*C': {
+        'value_specification': URIRef('http://purl.obolibrary.org/obo/OBI_0002138'), # temperature
+        'unit': URIRef('http://purl.obolibrary.org/obo/UO_0000027'), # degree Celsius
+        'datatype': XSD.decimal
+    },
+
+    r'Hz': {
+        'value_specification': URIRef('http://purl.obolibrary.org/obo/OBI_0001931'), # scalar value specification
+        'unit': URIRef('http://purl.obolibrary.org/obo/UO_0000106'), # hertz
+        'datatype': XSD.decimal
+    },
+
+    r'min': {
+        'value_specification': URIRef('http://purl.obolibrary.org/obo/OBI_0001931'), # scalar value specification
+        'unit': URIRef('http://purl.obolibrary.org/obo/UO_0000031'), # minute
+        'datatype': XSD.nonNegativeInteger
+    },
+    r'ms': {
+        'value_specification': URIRef('http://purl.obolibrary.org/obo/OBI_0001931'), # scalar value specification
+        'unit': URIRef('http://purl.obolibrary.org/obo/UO_0000028'), # millisecond
+        'datatype': XSD.nonNegativeInteger
+    },
+
+    r'V': {
+        'value_specification': URIRef('http://purl.obolibrary.org/obo/OBI_0001931'), # scalar value specification
+        'unit': URIRef('http://purl.obolibrary.org/obo/UO_0000218'), # volt
+        'datatype': XSD.nonNegativeInteger
+    },
+}
+
+# one group per unit, so that a single pass finds the quantities of all units
+# NOTE: longer symbols first, so that e.g. "ms" is not matched as "m"
+unit_groups = {
+    'unit%i' % (idx): symbol for idx, symbol in enumerate(sorted(units.keys(), key=len, reverse=True))
+}
+unit_pattern = re.compile(r'(?P<value>[+-]?[\.\d]+)\s*(?:%s)' % ('|'.join(
+    '(?P<%s>%s)' % (group, symbol) for group, symbol in unit_groups.items()
+)))
@@ -0,0 +1,77 @@
+from rdflib import URIRef
+
+# NOTE: the terms are created only once instead of for every triple
+
+# relative to the vocabulary of the RO-Crate context, i.e., schema.org
+class Schema:
+    Action = URIRef('Action')
+    CreativeWork = URIRef('CreativeWork')
+    Dataset = URIRef('Dataset')
+    File = URIRef('File')
+    IndividualProduct = URIRef('IndividualProduct')
+
+    about = URIRef('about')
+    affiliation = URIRef('affiliation')
+    conformsTo = URIRef('conformsTo')
+    contentSize = URIRef('contentSize')
+    creator = URIRef('creator')
+    # NOTE: written as full IRI
+    dateModified = URIRef('https://schema.org/dateModified')
+    datePublished = URIRef('datePublished')
+    description = URIRef('description')
+    email = URIRef('email')
+    encodingFormat = URIRef('encodingFormat')
+    hasFile = URIRef('hasFile')
+    hasPart = URIRef('hasPart')
+    identifier = URIRef('identifier')
+    keywords = URIRef('keywords')
+    license = URIRef('license')
+    name = URIRef('name')
+    sha512 = URIRef('sha512')
+    startTime = URIRef('startTime')
+    url = URIRef('url')
+
+class Prov:
+    Activity = URIRef('prov:Activity')
+    Association = URIRef('prov:Association')
+    Organization = URIRef('prov:Organization')
+    Person = URIRef('prov:Person')
+    Plan = URIRef('prov:Plan')
+
+    agent = URIRef('prov:agent')
+    hadPlan = URIRef('prov:hadPlan')
+    qualifiedAssociation = URIRef('prov:qualifiedAssociation')
+    used = URIRef('prov:used')
+    value = URIRef('prov:value')
+    wasAttributedTo = URIRef('prov:wasAttributedTo')
+    wasGeneratedBy = URIRef('prov:wasGeneratedBy')
+    wasInformedBy = URIRef('prov:wasInformedBy')
+
+class Foaf:
+    familyName = URIRef('foaf:familyName')
+    givenName = URIRef('foaf:givenName')
+    name = URIRef('foaf:name')
+
+class Bfo:
+    process = URIRef('bfo:process')
+
+class OBO:
+    objective_specification = URIRef('http://purl.obolibrary.org/obo/IAO_0000005')
+    has_measurement_unit_label = URIRef('http://purl.obolibrary.org/obo/IAO_0000039')
+    achieves_planned_objective = URIRef('http://purl.obolibrary.org/obo/OBI_0000417')
+    has_specified_input = URIRef('http://purl.obolibrary.org/obo/OBI_0000293')
+    has_specified_output = URIRef('http://purl.obolibrary.org/obo/OBI_0000299')
+    has_supplier = URIRef('http://purl.obolibrary.org/obo/OBI_0000647')
+    creating_a_mixture = URIRef('http://purl.obolibrary.org/obo/OBI_0000685')
+    material_combination_objective = URIRef('http://purl.obolibrary.org/obo/OBI_0000686')
+    manufacturer = URIRef('http://purl.obolibrary.org/obo/OBI_0000835')
+    has_value_specification = URIRef('http://purl.obolibrary.org/obo/OBI_0001938')
+    mixture = URIRef('http://purl.obolibrary.org/obo/OBI_0302729')
+
+# FIXME: define custom relations
+class Custom:
+    experiment_success = URIRef('experiment_success')
+    has_lot_number = URIRef('has_lot_number')
+    has_passage_number = URIRef('has_passage_number')
+    has_supplier_id = URIRef('has_supplier_id')
+    is_instance_of = URIRef('is_instance_of')
@@ -1 +1,8 @@
 from .ELN2Crate import ELN2Crate, ProtocolElementUnknown
+from .Batch import ELN2CrateBatch
+from .DatasetBuilder import DatasetBuilder
+from .ItemCache import ItemCache
+from .BlobStore import BlobStore
+from .Pseudonymizer import Pseudonymizer
+from .Snapshot import SnapshotExporter, SnapshotManager
+from .AsyncELN2Crate import AsyncELN2Crate, AsyncElabFTWClient
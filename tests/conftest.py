@@ -0,0 +1,15 @@
+import logging
+import os
+import sys
+
+import pytest
+
+# the tests use the synthetic experiments of the benchmarks instead of elabFTW
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger('eln2crate-tests')
+    logger.setLevel(logging.CRITICAL)
+
+    return logger
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from FakeManager import FakeManager # pylint: disable=import-error
+
+from eln2crate import AsyncELN2Crate, ItemCache
+from eln2crate.Download import iter_upload
+
+class AsyncFakeManager:
+    # asynchronous interface of AsyncElabFTWClient on top of the synthetic experiments
+    def __init__(self, **kwargs):
+        self.manager = FakeManager(**kwargs)
+
+    async def get_experiment(self, exp_id):
+        return self.manager.get_experiment(exp_id)
+
+    async def get_item(self, item_id):
+        return self.manager.get_item(item_id)
+
+    async def iter_upload(self, upload_id, chunk_size):
+        for chunk in iter_upload(self.manager, upload_id, chunk_size):
+            await asyncio.sleep(0)
+            yield bytes(chunk)
+
+def test_conversion_creates_the_crate(tmp_path, logger):
+    model = AsyncELN2Crate(logger, 'https://example.org/ns', 'https://elab.example.org',
+                           AsyncFakeManager(steps=5, items=3, mixtures=1, uploads=2, upload_size=1000),
+                           1, ['Max Mustermann'], characterization='native')
+    target_archive = str(tmp_path / 'ro-crate_1')
+
+    assert asyncio.run(model.convert(target_archive))
+    assert (tmp_path / 'ro-crate_1.zip').exists()
+    assert model.instrumentation.counters['bytes_downloaded'] == 2000
+
+def test_item_cache_is_rejected(tmp_path, logger):
+    # NOTE: the prefetched items must never replace the shared index of the cache
+    with pytest.raises(ValueError):
+        AsyncELN2Crate(logger, 'https://example.org/ns', 'https://elab.example.org',
+                       AsyncFakeManager(), 1, ['Max Mustermann'],
+                       item_cache=ItemCache(str(tmp_path / 'items.sqlite')))
@@ -0,0 +1,31 @@
+import threading
+import time
+
+from eln2crate import ELN2CrateBatch
+
+class SlowManager:
+    # experiment i has i uploads of 100 bytes, every request takes some time
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def get_experiment(self, exp_id):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        if exp_id == 0:
+            raise ValueError('Experiment 0 does not exist')
+
+        return {'id': exp_id, 'uploads': [{'filesize': '100'} for _ in range(exp_id)]}
+
+def test_schedule_fetches_concurrently_and_starts_with_large_uploads(logger):
+    manager = SlowManager()
+    batch = ELN2CrateBatch(logger, 'https://example.org/ns', 'https://elab.example.org', manager,
+                           ['Max Mustermann'], fetch_workers=3)
+
+    assert batch.schedule(iter([2, 0, 5, 1, 3])) == [5, 3, 2, 1, 0]
+    assert 1 < manager.max_active <= 3
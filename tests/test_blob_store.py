@@ -0,0 +1,33 @@
+import hashlib
+import os
+
+from eln2crate import BlobStore
+
+def test_write_text_replaces_existing_destination(tmp_path):
+    store = BlobStore(str(tmp_path / 'blobs'))
+    destination = str(tmp_path / 'item.html')
+
+    first = store.write_text('first body', destination)
+    second = store.write_text('second body', destination)
+
+    with open(destination) as item_file:
+        assert item_file.read() == 'second body'
+    # the blob of the first body must not have been overwritten through the hardlink
+    with open(store._get_blob_path(first['sha512'])) as blob_file: # pylint: disable=protected-access
+        assert blob_file.read() == 'first body'
+    assert first['sha512'] == hashlib.sha512(b'first body').hexdigest()
+    assert second['sha512'] == hashlib.sha512(b'second body').hexdigest()
+    assert sorted(os.listdir(str(tmp_path))) == ['blobs', 'item.html']
+
+def test_write_upload_replaces_existing_destination(tmp_path):
+    store = BlobStore(str(tmp_path / 'blobs'))
+    destination = str(tmp_path / 'data.csv')
+
+    store.write_upload('upload/1/2021-04-12 09:21:53', [b'1,2\n'], destination)
+    store.write_upload('upload/2/2021-04-12 09:21:53', [b'3,4\n'], destination)
+    store.write_upload('upload/1/2021-04-12 09:21:53', [b'ignored'], str(tmp_path / 'copy.csv'))
+
+    with open(destination, 'rb') as data_file:
+        assert data_file.read() == b'3,4\n'
+    with open(str(tmp_path / 'copy.csv'), 'rb') as data_file:
+        assert data_file.read() == b'1,2\n'
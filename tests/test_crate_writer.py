@@ -0,0 +1,61 @@
+import os
+import zipfile
+
+import pytest
+
+from eln2crate.CrateWriter import CrateWriter, ParallelCrateWriter
+
+WRITERS = [CrateWriter, ParallelCrateWriter]
+
+@pytest.fixture
+def crate_folder(tmp_path):
+    folder = tmp_path / 'crate'
+    (folder / 'Data').mkdir(parents=True)
+    (folder / 'Data' / 'data.csv').write_text('1,2\n')
+    (folder / 'Data' / 'image.czi').write_bytes(b'\0' * 1024)
+
+    return str(folder)
+
+@pytest.mark.parametrize('writer_class', WRITERS)
+def test_crate_contains_files_and_generated_content(tmp_path, crate_folder, writer_class):
+    target_file = str(tmp_path / 'ro-crate_1.zip')
+
+    writer_class().write(crate_folder, target_file, {
+        'ro-crate-metadata.json': lambda stream: stream.write(b'{}')
+    })
+
+    with zipfile.ZipFile(target_file) as zip_file:
+        assert zip_file.read('Data/data.csv') == b'1,2\n'
+        assert zip_file.getinfo('Data/image.czi').compress_type == zipfile.ZIP_STORED
+        assert zip_file.read('ro-crate-metadata.json') == b'{}'
+    assert sorted(os.listdir(str(tmp_path))) == ['crate', 'ro-crate_1.zip']
+
+@pytest.mark.parametrize('writer_class', WRITERS)
+def test_failed_write_leaves_no_archive_behind(tmp_path, crate_folder, writer_class):
+    def fail(stream):
+        stream.write(b'{')
+        raise ValueError('serialization failed')
+
+    with pytest.raises(ValueError):
+        writer_class().write(crate_folder, str(tmp_path / 'ro-crate_1.zip'), {
+            'ro-crate-metadata.json': fail
+        })
+
+    assert os.listdir(str(tmp_path)) == ['crate']
+
+@pytest.mark.parametrize('writer_class', WRITERS)
+def test_failed_file_leaves_no_archive_behind(tmp_path, crate_folder, writer_class):
+    writer = writer_class()
+    get_compress_type = writer.get_compress_type
+
+    def fail_for_images(filename):
+        # e.g., a file that cannot be read while the archive is written
+        if filename.endswith('.czi'):
+            raise OSError('image.czi cannot be read')
+        return get_compress_type(filename)
+    writer.get_compress_type = fail_for_images
+
+    with pytest.raises(OSError):
+        writer.write(crate_folder, str(tmp_path / 'ro-crate_1.zip'))
+
+    assert os.listdir(str(tmp_path)) == ['crate']
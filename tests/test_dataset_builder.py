@@ -0,0 +1,55 @@
+from FakeManager import FakeManager # pylint: disable=import-error
+
+from eln2crate import DatasetBuilder
+
+NAMESPACE_URL = 'https://example.org/ns'
+
+def test_shared_triples_are_written_once_into_the_common_graph(tmp_path, logger):
+    # both experiments link the same three items
+    manager = FakeManager(steps=5, items=3, mixtures=1, uploads=1, upload_size=100)
+    builder = DatasetBuilder(logger, NAMESPACE_URL, 'https://elab.example.org', manager,
+                             ['Max Mustermann'], characterization='native')
+    target_file = str(tmp_path / 'dataset.nq')
+
+    summary = builder.build([1, 2], target_file)
+
+    assert summary == {'succeeded': [1, 2], 'failed': {}}
+    with open(target_file, encoding='utf-8') as dataset_file:
+        quads = [line.rsplit(' ', 2)[:2] for line in dataset_file.read().splitlines()]
+    graphs = {}
+    for triple, graph in quads:
+        graphs.setdefault(triple, []).append(graph)
+
+    assert [triple for triple, names in graphs.items() if len(names) > 1] == []
+    assert {graph for _, graph in quads} == {
+        '<%s/>' % (NAMESPACE_URL), '<%s/1/>' % (NAMESPACE_URL), '<%s/2/>' % (NAMESPACE_URL)
+    }
+    item = '<%s/database/1>' % (NAMESPACE_URL)
+    common_graph = ['<%s/>' % (NAMESPACE_URL)]
+    assert graphs['%s <http://xmlns.com/foaf/0.1/name> "Item 1"@en' % (item)] == common_graph
+    assert graphs[
+        '%s <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://schema.org/IndividualProduct>'
+        % (item)
+    ] == common_graph
+    # the exported file of the item belongs to the crate of each experiment
+    for exp_id in [1, 2]:
+        assert graphs[
+            '%s <http://schema.org/hasFile> <%s/%i/Protocol/Database/Category%%201%%20-%%20Item%%201.html>'
+            % (item, NAMESPACE_URL, exp_id)
+        ] == ['<%s/%i/>' % (NAMESPACE_URL, exp_id)]
+
+class MissingExperimentManager(FakeManager):
+    def get_experiment(self, exp_id):
+        if int(exp_id) == 2:
+            raise KeyError('experiment 2')
+
+        return super().get_experiment(exp_id)
+
+def test_failed_experiments_are_reported(tmp_path, logger):
+    manager = MissingExperimentManager(steps=5, items=3, mixtures=0, uploads=0)
+    builder = DatasetBuilder(logger, NAMESPACE_URL, 'https://elab.example.org', manager,
+                             ['Max Mustermann'], characterization='native')
+
+    summary = builder.build([1, 2, 3], str(tmp_path / 'dataset.nq'))
+
+    assert summary == {'succeeded': [1, 3], 'failed': {2: "KeyError: 'experiment 2'"}}
@@ -0,0 +1,69 @@
+import hashlib
+import os
+
+from FakeManager import FakeManager # pylint: disable=import-error
+
+from eln2crate import ELN2Crate, ProtocolElementUnknown
+from eln2crate.ELN2Crate import get_error_message
+from eln2crate.Vocabulary import Prov
+
+class DuplicateUploadManager(FakeManager):
+    # all uploads of the experiment have the same name
+    def get_experiment(self, exp_id):
+        exp = super().get_experiment(exp_id)
+        for upload in exp['uploads']:
+            upload['real_name'] = 'data.csv'
+
+        return exp
+
+def test_uploads_with_the_same_name_are_written_once(logger):
+    manager = DuplicateUploadManager(steps=5, items=2, mixtures=0, uploads=4, upload_size=256*1024)
+    model = ELN2Crate(logger, 'https://example.org/ns', 'https://elab.example.org', manager, 1,
+                      ['Max Mustermann'], characterization='native', download_chunk_size=1024)
+    model.write_files()
+
+    with open(os.path.join(model.tempfolder, 'Data', 'data.csv'), 'rb') as data_file:
+        data = data_file.read()
+    # like a sequential download, the file contains the last upload
+    assert data == b''.join(manager.iter_upload(model.exp['uploads'][-1]['id'], 1024))
+    assert model.manifest.get_file('Data/data.csv') == {
+        'filesize': len(data),
+        'sha512': hashlib.sha512(data).hexdigest()
+    }
+
+class PersonUploadManager(FakeManager):
+    # the first upload is named after the researcher, the link contains the encoded name
+    def get_experiment(self, exp_id):
+        exp = super().get_experiment(exp_id)
+        exp['uploads'][0]['real_name'] = 'Max Mustermann data_0.csv'
+        exp['body'] = exp['body'].replace('name=data_0.csv', 'name=Max%20Mustermann%20data_0.csv')
+
+        return exp
+
+def test_names_in_download_links_are_pseudonymized(logger):
+    manager = PersonUploadManager(steps=5, items=2, mixtures=0, uploads=1, upload_size=100)
+    model = ELN2Crate(logger, 'https://example.org/ns', 'https://elab.example.org', manager, 1,
+                      ['Max Mustermann'], characterization='native')
+    model.write_files()
+    graph = model.create_model()
+
+    protocol_path = os.path.join(model.tempfolder, 'Protocol', model.exp['title'] + '.html')
+    with open(protocol_path, encoding='utf-8') as protocol_file:
+        protocol = protocol_file.read()
+    assert 'Mustermann' not in protocol
+    assert 'name=Anonymous%20Person1%20data_0.csv' in protocol
+    assert os.listdir(os.path.join(model.tempfolder, 'Data')) == ['Anonymous Person1 data_0.csv']
+    # the link connects the renamed file to the steps
+    assert list(graph.objects(model.id_generator.getFile('Data/Anonymous Person1 data_0.csv'),
+                              Prov.wasGeneratedBy))
+
+def test_error_messages_of_failed_conversions(logger):
+    try:
+        raise ProtocolElementUnknown('Stage "Unknown stage"')
+    except ProtocolElementUnknown as e:
+        assert get_error_message(logger, 1, e) == 'Protocol element is unknown: Stage "Unknown stage"'
+
+    try:
+        raise KeyError('ro-crate_link')
+    except KeyError as e:
+        assert get_error_message(logger, 1, e) == "KeyError: 'ro-crate_link'"
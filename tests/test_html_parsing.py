@@ -0,0 +1,57 @@
+import pytest
+
+from bs4 import BeautifulSoup
+
+from eln2crate.HTMLParsing import parse_html, parse_item_table, serialize_html
+
+# fragments as found in the bodies of elabFTW experiments
+WELL_FORMED = [
+    '<h1>Protocol</h1>\n<table>\n<tbody>\n<tr>\n<td>Description</td>\n</tr>\n</tbody>\n</table>\n',
+    '<!-- exported --><p>Wash the cells at 37 °C</p>',
+    '<h1>A &amp; B</h1>\n<!-- end -->',
+    'text before <b>bold</b> and after',
+    '<p>a<br>b &nbsp;&amp; <img src="x.png"></p>',
+    '<p>unclosed <b>bold</p>'
+]
+MALFORMED = [
+    '<p><table><tr><td>a</td></tr></table></p>',
+    '<ul><li>a<li>b</ul>',
+    '<!-- a -->\n<h1>A</h1>',
+    '<p>first<p>second'
+]
+
+@pytest.mark.parametrize('html', WELL_FORMED + MALFORMED)
+def test_default_parser_keeps_the_output_of_html_parser(html):
+    assert serialize_html(parse_html(html), html) == str(BeautifulSoup(html, 'html.parser'))
+
+@pytest.mark.parametrize('html', WELL_FORMED)
+def test_lxml_output_is_identical_for_well_formed_html(html):
+    pytest.importorskip('lxml')
+
+    assert serialize_html(parse_html(html, 'lxml'), html) \
+        == serialize_html(parse_html(html, 'html.parser'), html)
+
+@pytest.mark.parametrize('html', MALFORMED)
+def test_lxml_repairs_malformed_html_differently(html):
+    # NOTE: the reason why lxml is only used if it is selected explicitly
+    pytest.importorskip('lxml')
+
+    assert serialize_html(parse_html(html, 'lxml'), html) \
+        != serialize_html(parse_html(html, 'html.parser'), html)
+
+ITEM_TABLE = '<table><tbody><tr><td>ontology-item</td><td>http://purl.obolibrary.org/obo/CLO_0000001</td></tr></tbody></table>'
+
+@pytest.mark.parametrize('html', [
+    '<p>Ordered</p>\n%s\n<p>end</p>' % (ITEM_TABLE),
+    '<table><tr><td><table><tr><td>nested</td></tr></table></td></tr></table>%s' % (ITEM_TABLE),
+    # the table inside the comment is not part of the document
+    '<!-- <table><tr><td>old</td></tr></table> -->\n%s' % (ITEM_TABLE),
+    '<script>var html = "<table>";</script>%s' % (ITEM_TABLE),
+    # truncated closing tag
+    '%s</tbody></table' % (ITEM_TABLE[:-len('</tbody></table>')]),
+    '<p>no table</p>'
+])
+def test_item_table_is_the_first_table_of_the_document(html):
+    expected = BeautifulSoup(html, 'html.parser').find('table')
+
+    assert str(parse_item_table(html).find('table')) == str(expected)
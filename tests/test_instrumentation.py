@@ -0,0 +1,34 @@
+import tracemalloc
+
+from eln2crate.Instrumentation import Instrumentation
+
+def test_process_peak_memory_is_recorded_for_each_phase():
+    instrumentation = Instrumentation()
+    with instrumentation.phase('fetch'):
+        pass
+    with instrumentation.phase('fetch'):
+        pass
+
+    measurement = instrumentation.as_dict()['phases']['fetch']
+    assert measurement['calls'] == 2
+    assert measurement['process_peak_memory'] > 0
+    # the per-phase peak is only known with tracemalloc
+    assert 'peak_memory' not in measurement
+
+def test_traced_peak_memory_belongs_to_each_phase():
+    instrumentation = Instrumentation(trace_memory=True)
+    try:
+        with instrumentation.phase('zip'):
+            with instrumentation.phase('serialize'):
+                data = bytearray(16 * 1024 * 1024)
+                del data
+        with instrumentation.phase('characterize'):
+            bytearray(1024)
+    finally:
+        tracemalloc.stop()
+
+    phases = instrumentation.as_dict()['phases']
+    assert phases['serialize']['peak_memory'] >= 16 * 1024 * 1024
+    # the peak of a nested phase is part of the enclosing phase
+    assert phases['zip']['peak_memory'] >= phases['serialize']['peak_memory']
+    assert phases['characterize']['peak_memory'] < 16 * 1024 * 1024
@@ -0,0 +1,50 @@
+import sqlite3
+
+from contextlib import closing
+
+from eln2crate import ItemCache
+
+class ItemManager:
+    def __init__(self):
+        self.items = {}
+        self.requests = 0
+
+    def set_item(self, item_id, body, lastchange):
+        self.items[str(item_id)] = {'id': str(item_id), 'body': body, 'lastchange': lastchange}
+
+    def get_item(self, item_id):
+        self.requests += 1
+        return dict(self.items[str(item_id)])
+
+    def get_all_items(self):
+        return [{'id': item_id, 'lastchange': item['lastchange']} for item_id, item in self.items.items()]
+
+def test_unchanged_items_are_not_downloaded_again(tmp_path):
+    cache = ItemCache(str(tmp_path / 'items.sqlite'))
+    manager = ItemManager()
+    manager.set_item(1, 'body v1', '2021-01-21 16:00:00')
+
+    assert cache.get_item(manager, 1)['body'] == 'body v1'
+    assert cache.get_item(manager, 1)['body'] == 'body v1'
+    assert manager.requests == 1
+
+def test_changed_items_are_reloaded_by_long_lived_instances(tmp_path):
+    cache = ItemCache(str(tmp_path / 'items.sqlite'), index_max_age=0)
+    manager = ItemManager()
+    manager.set_item(1, 'body v1', '2021-01-21 16:00:00')
+    assert cache.get_item(manager, 1)['body'] == 'body v1'
+
+    manager.set_item(1, 'body v2', '2021-01-22 09:00:00')
+
+    assert cache.get_item(manager, 1)['body'] == 'body v2'
+
+def test_long_lived_instances_evict_entries(tmp_path):
+    path = str(tmp_path / 'items.sqlite')
+    cache = ItemCache(path, max_entries=2, evict_interval=0)
+    manager = ItemManager()
+    for item_id in range(1, 6):
+        manager.set_item(item_id, 'body %i' % (item_id), '2021-01-21 16:00:00')
+        cache.get_item(manager, item_id)
+
+    with closing(sqlite3.connect(path)) as conn:
+        assert sorted(row[0] for row in conn.execute('SELECT id FROM items')) == ['4', '5']
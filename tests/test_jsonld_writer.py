@@ -0,0 +1,53 @@
+import io
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import FOAF, RDF, XSD
+
+from eln2crate.JSONLDWriter import JSONLDWriter
+
+SCHEMA = 'http://schema.org/'
+# the local part of the context of ELN2Crate, the remote RO-Crate context is not fetched
+CONTEXT = {
+    'foaf': str(FOAF),
+    'xsd': str(XSD),
+    'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+    'prov': 'http://www.w3.org/ns/prov#',
+    'schema': SCHEMA
+}
+
+def build_graph():
+    graph = Graph()
+    experiment = URIRef('https://example.org/ns/1/')
+    researcher = BNode()
+    graph.add((experiment, RDF.type, URIRef(SCHEMA + 'Dataset')))
+    graph.add((experiment, RDF.type, URIRef('http://www.w3.org/ns/prov#Plan')))
+    graph.add((experiment, FOAF.name, Literal('Ca imaging', lang='en')))
+    graph.add((experiment, FOAF.name, Literal('Ca-Bildgebung', lang='de')))
+    graph.add((experiment, URIRef(SCHEMA + 'dateModified'),
+               Literal('2021-04-12T09:21:53', datatype=XSD.dateTime)))
+    graph.add((experiment, URIRef(SCHEMA + 'isAccessibleForFree'), Literal(True)))
+    graph.add((experiment, URIRef(SCHEMA + 'position'), Literal(3)))
+    graph.add((experiment, URIRef(SCHEMA + 'value'), Literal(1.5)))
+    graph.add((experiment, URIRef(SCHEMA + 'description'), Literal('Wash "cells"\nat 37 °C')))
+    graph.add((experiment, URIRef(SCHEMA + 'author'), researcher))
+    graph.add((researcher, RDF.type, FOAF.Person))
+    graph.add((researcher, FOAF.name, Literal('Anonymous Person1')))
+    graph.add((researcher, URIRef(SCHEMA + 'affiliation'), URIRef('https://ror.org/01226dv09')))
+
+    return graph
+
+def test_writer_parses_to_the_same_graph_as_rdflib():
+    graph = build_graph()
+    stream = io.BytesIO()
+    JSONLDWriter(CONTEXT).write(graph, stream)
+
+    written = Graph().parse(data=stream.getvalue().decode('utf-8'), format='json-ld')
+    expected = Graph().parse(
+        data=graph.serialize(format='json-ld', context=CONTEXT).decode('utf-8'),
+        format='json-ld'
+    )
+
+    assert len(written) == len(graph)
+    assert isomorphic(written, expected)
+    assert isomorphic(written, graph)
@@ -0,0 +1,37 @@
+import pytest
+
+from eln2crate.Activities import activities
+from eln2crate.ELN2Crate import activity_matcher, manufacturer_matcher
+from eln2crate.KeywordMatcher import KeywordMatcher
+from eln2crate.Manufacturers import manufacturers
+
+def test_overlapping_keywords_are_all_found():
+    matcher = KeywordMatcher(['hers', 'he', 'she', 'his'])
+
+    assert matcher.find_all('ushers') == ['hers', 'he', 'she']
+    assert matcher.find_first('ushers') == 'hers'
+    assert matcher.find_first('nothing') is None
+
+@pytest.mark.parametrize('description, expected', [
+    # several activities of one step are reported in the order of the dictionary
+    ('incubate 10 min, then wash and add 2 ml', ['wash', 'add', 'incubate']),
+    ('take out from fridge and store', ['store', 'take out']),
+    # substrings count like before, e.g., "store" inside "restore"
+    ('restore the dish', ['store']),
+    ('measure the signal', [])
+])
+def test_activities_of_a_step(description, expected):
+    assert activity_matcher.find_all(description) == expected
+    # same result as the previous scan over all indicators
+    assert expected == [indicator for indicator in activities if indicator in description]
+
+@pytest.mark.parametrize('name, expected', [
+    ('eppendorf', 'eppendorf'),
+    # the first key of the dictionary wins, not the first occurrence in the name
+    ('eppendorf tubes, distributed by atcc', 'atcc'),
+    ('sigma aldrich via life technologies gmbh', 'life technologies gmbh'),
+    ('unknown supplier', None)
+])
+def test_first_manufacturer_key_wins(name, expected):
+    assert manufacturer_matcher.find_first(name) == expected
+    assert expected == next((key for key in manufacturers if key in name), None)
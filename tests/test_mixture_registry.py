@@ -0,0 +1,28 @@
+from eln2crate.MixtureRegistry import MixtureRegistry
+
+MEDIUM = 'mixture/99-1_1-2'
+
+def test_mixture_is_reused_for_the_same_attribution():
+    registry = MixtureRegistry()
+
+    assert registry.get_mixture(MEDIUM, 'researcher/1') == (1, False)
+    assert registry.get_mixture(MEDIUM, 'researcher/1') == (1, True)
+    # another researcher or no attribution results in a new mixture
+    assert registry.get_mixture(MEDIUM, 'researcher/2') == (2, False)
+    assert registry.get_mixture(MEDIUM) == (3, False)
+    assert registry.get_mixture(MEDIUM) == (3, True)
+    assert registry.get_mixture(MEDIUM, 'researcher/2') == (2, True)
+
+def test_mixtures_are_numbered_per_medium():
+    registry = MixtureRegistry()
+
+    assert registry.get_mixture(MEDIUM) == (1, False)
+    assert registry.get_mixture('mixture/95-1_5-3') == (1, False)
+
+def test_plans_are_reused_for_the_same_label():
+    registry = MixtureRegistry()
+
+    assert registry.get_plan(MEDIUM, 'Preparation') == (1, False)
+    assert registry.get_plan(MEDIUM, 'Cell culture') == (2, False)
+    assert registry.get_plan(MEDIUM, 'Preparation') == (1, True)
+    assert registry.get_plan('mixture/95-1_5-3', 'Preparation') == (1, False)
@@ -0,0 +1,31 @@
+import pytest
+
+from eln2crate import Pseudonymizer
+
+def test_names_are_replaced_by_their_position():
+    pseudonymizer = Pseudonymizer(['Max Mustermann', 'Erika Muster'])
+
+    assert pseudonymizer.pseudonymize('Erika Muster and Max Mustermann') \
+        == 'Anonymous Person2 and Anonymous Person1'
+
+@pytest.mark.parametrize('href, expected', [
+    (
+        'app/download.php?f=ab.csv&name=Max%20Mustermann%20data.csv&forceDownload',
+        'app/download.php?f=ab.csv&name=Anonymous%20Person1%20data.csv&forceDownload'
+    ),
+    (
+        'app/download.php?f=ab.csv&name=Max+Mustermann+data.csv',
+        'app/download.php?f=ab.csv&name=Anonymous%20Person1%20data.csv'
+    ),
+    (
+        'app/download.php?name=Max%20Mustermann.csv#top',
+        'app/download.php?name=Anonymous%20Person1.csv#top'
+    ),
+    # links without names stay unchanged, including their encoding
+    (
+        'app/download.php?f=ab.csv&name=data+1.csv&forceDownload',
+        'app/download.php?f=ab.csv&name=data+1.csv&forceDownload'
+    )
+])
+def test_encoded_names_in_links_are_replaced(href, expected):
+    assert Pseudonymizer(['Max Mustermann']).pseudonymize_link(href) == expected
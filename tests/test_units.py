@@ -0,0 +1,34 @@
+from rdflib.namespace import XSD
+
+from eln2crate.Units import unit_groups, unit_pattern, units
+
+UO = 'http://purl.obolibrary.org/obo/UO_'
+
+def find_parameters(description):
+    return [
+        (
+            match.group(),
+            match.group('value'),
+            str(units[unit_groups[match.lastgroup]]['unit']),
+            units[unit_groups[match.lastgroup]]['datatype']
+        )
+        for match in unit_pattern.finditer(description)
+    ]
+
+def test_overlapping_minute_and_millisecond_symbols():
+    assert find_parameters('Incubate 5 min, stimulate for 20 ms and wait 3min') == [
+        ('5 min', '5', UO + '0000031', XSD.nonNegativeInteger),
+        ('20 ms', '20', UO + '0000028', XSD.nonNegativeInteger),
+        ('3min', '3', UO + '0000031', XSD.nonNegativeInteger)
+    ]
+
+def test_all_units_of_a_step_are_found_in_one_pass():
+    assert find_parameters('Stimulation with 5 V at 1.5 Hz and 37 ° C, then 37°C') == [
+        ('5 V', '5', UO + '0000218', XSD.nonNegativeInteger),
+        ('1.5 Hz', '1.5', UO + '0000106', XSD.decimal),
+        ('37 ° C', '37', UO + '0000027', XSD.decimal),
+        ('37°C', '37', UO + '0000027', XSD.decimal)
+    ]
+
+def test_numbers_without_known_units_are_ignored():
+    assert find_parameters('Add 2 ml of medium to 3 dishes') == []